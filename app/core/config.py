@@ -52,6 +52,7 @@ class Settings(BaseSettings):
     # --- Translation Logging Settings (新增) ---
     ENABLE_TRANSLATION_LOGGING: bool = True
     TRANSLATION_LOG_FILE: Path = Path("translation_logs/translations.jsonl") # 使用 .jsonl 副檔名
+    TRANSLATION_MAX_CONCURRENCY: int = 4 # Upper bound on translation requests in flight to Ollama at once
 
     model_config = SettingsConfigDict(
         env_file=".env", 
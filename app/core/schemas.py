@@ -118,13 +118,23 @@ class DialogueTurn(NPCIdentifier):
     model_used: str
     timestamp_api_generated: datetime = Field(default_factory=default_aware_utcnow, description="Timestamp when this turn was generated by the API.")
     llm_generated_emotional_tone: Optional[str] = Field(None, description="Emotional tone inferred or explicitly stated by the LLM.")
-    turn_processing_time_ms: Optional[float] = Field(None, description="Processing time for this individual turn.")
+    turn_processing_time_ms: Optional[float] = Field(None, description="Processing time for generating this individual turn (translation runs separately and is not included).")
 
 class GameInteractionResponse(BaseModel):
     interaction_session_id: str = Field(default_factory=lambda: f"gi_{uuid.uuid4().hex[:10]}")
     dialogue_history: List[DialogueTurn]
     total_api_processing_time_ms: float
 
+class BatchTranslationRequest(BaseModel):
+    texts: conlist(str, min_length=1, max_length=256) = Field(..., description="Texts to translate, in order.")
+    target_language: str = Field("Traditional Chinese", description="Language to translate into.")
+    source_language: Optional[str] = Field("English", description="Language of the texts. None lets the model infer it.")
+    model: Optional[str] = Field(None, description="Translation model override. Defaults to DEFAULT_TRANSLATION_MODEL if None.")
+
+class BatchTranslationResponse(BaseModel):
+    translations: List[Optional[str]] = Field(..., description="Translations in input order; None for empty inputs.")
+    total_api_processing_time_ms: float
+
 # --- NPC 狀態與記憶核心模型 (NPC State & Memory Core Models) ---
 class NPCEmotionalState(BaseModel):
     primary_emotion: str = Field("neutral", examples=["neutral", "happy", "sad", "angry", "fearful", "curious", "annoyed", "content"]) 
@@ -7,6 +7,7 @@ from app.core.logging_config import setup_logging
 from app.core.schemas import Message, OllamaChatOptions 
 from datetime import datetime, timezone
 import httpx # For httpx.ReadTimeout
+import logging
 
 logger = setup_logging(__name__)
 
@@ -228,7 +229,8 @@ class OllamaService:
         elif settings.DEFAULT_MAX_TOKENS > 0 : 
              ollama_options_dict = {"num_ctx": settings.DEFAULT_MAX_TOKENS}
 
-        logger.debug(f"Sending chat request to Ollama. Model: {effective_model}, Messages count: {len(formatted_messages)}, Stream: {stream}, Options: {ollama_options_dict}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Sending chat request to Ollama. Model: {effective_model}, Messages count: {len(formatted_messages)}, Stream: {stream}, Options: {ollama_options_dict}")
         
         try:
             raw_chat_response_object = await client.chat( 
@@ -1,6 +1,9 @@
 # npc_api_suite/app/llm/prompt_builder.py
 
-from typing import List, Optional, Dict, Union
+from typing import Final, List, Mapping, Optional, Tuple, Union
+from functools import lru_cache
+from types import MappingProxyType
+import logging
 from app.core.schemas import (
     NPCIdentifier, GameTime, NPCEmotionalState, NPCScheduleRule,
     EntityContextInfo, LandmarkContextInfo, SceneBoundaryInfo, Message, MessageRole,
@@ -9,68 +12,118 @@ from app.core.schemas import (
 from app.core.config import settings_instance as settings
 from app.core.logging_config import setup_logging
 from datetime import datetime, timezone
+import heapq
+from bisect import bisect_right
 
 logger = setup_logging(__name__)
 
-DIALOGUE_MODE_INSTRUCTIONS: Dict[str, str] = {
+# Read-only: the memoized dialogue prompts below would silently go stale if this were mutated at runtime.
+DIALOGUE_MODE_INSTRUCTIONS: Mapping[str, str] = MappingProxyType({
     "formal_scholar": "Speak formally, educatedly, pedantically. Use precise language, occasionally reference obscure facts.",
     "curious_child": "You are curious, ask many questions. Speak with youthful innocence, wonder, simple vocabulary.",
     "grumpy_merchant": "You are a grumpy, impatient merchant. Be terse, focus on practical matters. Not overly friendly unless it serves you.",
     "street_urchin_talkative": "You are a cunning, talkative street urchin. Use slang, be cheeky, try to glean info or advantage.",
     "wise_elder": "Speak with wisdom, patience, calm demeanor. Offer advice or cryptic hints.",
     "default": "Respond naturally and appropriately based on your core personality and the immediate situation."
-}
-
-def build_dialogue_system_prompt(
-    npc_info: NPCIdentifier,
-    interacting_with_entities: List[NPCIdentifier],
-    scene_context_description: Optional[str] = None,
-    dialogue_mode_tag: Optional[str] = "default",
-    npc_emotional_state_input: Optional[str] = None,
-    additional_dialogue_goal: Optional[str] = None
+})
+_DEFAULT_MODE_INSTRUCTION: Final[str] = DIALOGUE_MODE_INSTRUCTIONS["default"]
+_DIALOGUE_TAIL: Final[str] = "Keep responses concise, in character. Avoid unprovided info unless minor, character-consistent detail."
+
+@lru_cache(maxsize=2048)
+def _build_dialogue_system_prompt_cached(
+    npc_display_name: str,
+    npc_id: str,
+    interacting_names: Tuple[str, ...],
+    scene_context_description: Optional[str],
+    dialogue_mode_tag: Optional[str],
+    npc_emotional_state_input: Optional[str],
+    additional_dialogue_goal: Optional[str]
 ) -> str:
+    # An NPC's dialogue turns mostly repeat the same inputs, so the joined prompt is memoized on hashable keys.
     prompt_parts = [
-        f"You are game character '{npc_info.name or npc_info.npc_id}' (ID: {npc_info.npc_id})."
+        f"You are game character '{npc_display_name}' (ID: {npc_id})."
     ]
     if npc_emotional_state_input:
         prompt_parts.append(f"Currently {npc_emotional_state_input}.")
 
-    mode_instruction = DIALOGUE_MODE_INSTRUCTIONS.get(dialogue_mode_tag or "default", DIALOGUE_MODE_INSTRUCTIONS["default"])
+    mode_instruction = DIALOGUE_MODE_INSTRUCTIONS.get(dialogue_mode_tag, _DEFAULT_MODE_INSTRUCTION) if dialogue_mode_tag else _DEFAULT_MODE_INSTRUCTION
     prompt_parts.append(mode_instruction)
 
     if scene_context_description:
         prompt_parts.append(f"Scene: {scene_context_description}.")
 
-    if interacting_with_entities:
-        other_names = [entity.name or entity.npc_id for entity in interacting_with_entities]
-        if other_names:
-            prompt_parts.append(f"Interacting with: {', '.join(other_names)}.")
+    if interacting_names:
+        prompt_parts.append(f"Interacting with: {', '.join(interacting_names)}.")
     else:
         prompt_parts.append("You might be speaking to an unseen player or thinking aloud.")
 
     if additional_dialogue_goal:
         prompt_parts.append(f"Your goal: {additional_dialogue_goal}")
 
-    prompt_parts.append("Keep responses concise, in character. Avoid unprovided info unless minor, character-consistent detail.")
-    final_prompt = " ".join(prompt_parts)
-    logger.debug(f"Built dialogue system prompt for {npc_info.npc_id} (mode: {dialogue_mode_tag}): '{final_prompt[:150]}...'")
+    prompt_parts.append(_DIALOGUE_TAIL)
+    return " ".join(prompt_parts)
+
+def build_dialogue_system_prompt(
+    npc_info: NPCIdentifier,
+    interacting_with_entities: List[NPCIdentifier],
+    scene_context_description: Optional[str] = None,
+    dialogue_mode_tag: Optional[str] = "default",
+    npc_emotional_state_input: Optional[str] = None,
+    additional_dialogue_goal: Optional[str] = None
+) -> str:
+    final_prompt = _build_dialogue_system_prompt_cached(
+        npc_info.name or npc_info.npc_id,
+        npc_info.npc_id,
+        tuple(entity.name or entity.npc_id for entity in interacting_with_entities) if interacting_with_entities else (),
+        scene_context_description,
+        dialogue_mode_tag,
+        npc_emotional_state_input,
+        additional_dialogue_goal
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Built dialogue system prompt for {npc_info.npc_id} (mode: {dialogue_mode_tag}): '{final_prompt[:150]}...'")
     return final_prompt
 
+@lru_cache(maxsize=64)
+def _translation_system_message(source_language: Optional[str], target_language: str) -> Message:
+    # Only a few language pairs are ever used, so each system message is built once and shared by every request
+    # for that pair (callers only read it). Role and content are valid by construction, so validation is skipped.
+    system_content_parts = [
+        f"Translate the user's text from {source_language if source_language else 'original language'} to {target_language}.",
+        "Preserve meaning, tone, style, nuance. Find equivalent expressions for colloquialisms.",
+        "Output ONLY the translated text. NO commentary or explanations."
+    ]
+    return Message.model_construct(role=MessageRole.SYSTEM, content=" ".join(system_content_parts))
+
 def build_translation_prompt_messages(
     text_to_translate: str,
     target_language: str = "Traditional Chinese",
     source_language: Optional[str] = "English"
 ) -> List[Message]:
+    return [
+        _translation_system_message(source_language, target_language),
+        Message.model_construct(role=MessageRole.USER, content=text_to_translate)
+    ]
+
+@lru_cache(maxsize=64)
+def _batch_translation_system_message(source_language: Optional[str], target_language: str) -> Message:
     system_content_parts = [
-        f"Translate the user's text from {source_language if source_language else 'original language'} to {target_language}.",
+        f"Translate each numbered line of the user's text from {source_language if source_language else 'original language'} to {target_language}, independently of the other lines.",
         "Preserve meaning, tone, style, nuance. Find equivalent expressions for colloquialisms.",
-        "Output ONLY the translated text. NO commentary or explanations."
+        "Output ONLY the translated lines, one per input line, in the same order, each formatted as '<number>: <translation>'. NO commentary or explanations."
     ]
-    system_content = " ".join(system_content_parts)
+    return Message.model_construct(role=MessageRole.SYSTEM, content=" ".join(system_content_parts))
 
+def build_batch_translation_prompt_messages(
+    texts_to_translate: List[str],
+    target_language: str = "Traditional Chinese",
+    source_language: Optional[str] = "English"
+) -> List[Message]:
+    """Builds one request translating several single-line texts; the user message numbers them from 1."""
+    numbered_lines = "\n".join(f"{line_number}: {text}" for line_number, text in enumerate(texts_to_translate, start=1))
     return [
-        Message(role=MessageRole.SYSTEM, content=system_content),
-        Message(role=MessageRole.USER, content=text_to_translate)
+        _batch_translation_system_message(source_language, target_language),
+        Message.model_construct(role=MessageRole.USER, content=numbered_lines)
     ]
 
 # *** 極端精簡列表項目數量以縮短提示詞 ***
@@ -79,80 +132,151 @@ MAX_LANDMARKS_TO_LIST = 2       # 原為 3
 MAX_LOCATION_HISTORY_TO_LIST = 1 # 保持 1
 MAX_LTM_TO_LIST_IN_PROMPT = 0    # 暫時不提供長期記憶
 
-def _format_current_time_for_prompt(game_time: GameTime) -> str:
-    day_info = f" on {game_time.day_of_week}" if game_time.day_of_week else ""
+@lru_cache(maxsize=1024)
+def _format_current_time_cached(time_of_day: str, day_of_week: Optional[str], timestamp: Optional[datetime], tz_key: object) -> str:
+    # tz_key is the timestamp's tzinfo: equal instants in different zones must not share a cached '%H:%M %Z' string.
+    day_info = f" on {day_of_week}" if day_of_week else ""
     time_str = "Unknown Time"
-    if game_time.current_timestamp and isinstance(game_time.current_timestamp, datetime):
+    if timestamp and isinstance(timestamp, datetime):
         try:
-            if game_time.current_timestamp.tzinfo is None:
-                aware_time = game_time.current_timestamp.replace(tzinfo=timezone.utc)
+            if timestamp.tzinfo is None:
+                aware_time = timestamp.replace(tzinfo=timezone.utc)
                 time_str = aware_time.strftime('%H:%M %Z')
             else:
-                time_str = game_time.current_timestamp.strftime('%H:%M %Z')
+                time_str = timestamp.strftime('%H:%M %Z')
         except Exception as e:
             logger.warning(f"Error formatting game_time.current_timestamp: {e}")
-            if isinstance(game_time.current_timestamp, datetime):
-                 time_str = game_time.current_timestamp.isoformat()
+            time_str = timestamp.isoformat()
 
-    return f"{game_time.time_of_day}{day_info} (Timestamp: {time_str})."
+    return f"{time_of_day}{day_info} (Timestamp: {time_str})."
+
+def _format_current_time_for_prompt(game_time: GameTime) -> str:
+    # Many NPCs are ticked with the same GameTime, so the strftime work is shared through the cache.
+    # Only '%H:%M' is printed, so the key is truncated to the minute; otherwise every new second would miss.
+    timestamp = game_time.current_timestamp if isinstance(game_time.current_timestamp, datetime) else None
+    if timestamp:
+        timestamp = timestamp.replace(second=0, microsecond=0)
+    return _format_current_time_cached(
+        game_time.time_of_day, game_time.day_of_week, timestamp, timestamp.tzinfo if timestamp else None
+    )
 
 
+@lru_cache(maxsize=1024)
+def _format_emotional_state_cached(primary_emotion: str, intensity: float, mood_tags: Tuple[str, ...]) -> str:
+    if mood_tags:
+        return f"Emotion: '{primary_emotion}' (Intensity: {intensity:.1f}/1.0). Moods: {', '.join(mood_tags)}."
+    return f"Emotion: '{primary_emotion}' (Intensity: {intensity:.1f}/1.0)."
+
 def _format_emotional_state_for_prompt(emotional_state: NPCEmotionalState) -> str:
-    moods = f" Moods: {', '.join(emotional_state.mood_tags)}." if emotional_state.mood_tags else ""
-    return f"Emotion: '{emotional_state.primary_emotion}' (Intensity: {emotional_state.intensity:.1f}/1.0).{moods}"
+    return _format_emotional_state_cached(
+        emotional_state.primary_emotion, emotional_state.intensity, tuple(emotional_state.mood_tags)
+    )
+
+def _truncate(text: str, max_len: int) -> str:
+    """Cuts `text` to `max_len` characters, appending '...' only when something was cut."""
+    return text if len(text) <= max_len else text[:max_len] + "..."
+
+def _format_coords(x: float, y: float) -> str:
+    """Formats a coordinate pair as '(x,y)' rounded to whole units; int formatting is cheaper than '%.0f'."""
+    try:
+        return f"({round(x)},{round(y)})"
+    except (ValueError, OverflowError): # NaN / inf cannot be rounded to int
+        return f"({x:.0f},{y:.0f})"
+
+@lru_cache(maxsize=256)
+def _format_schedule_rule_cached(
+    time_period_tag: str, activity_description: str, target_name: Optional[str],
+    target_x: Optional[float], target_y: Optional[float], is_mandatory: bool, has_more_rules: bool
+) -> str:
+    # An NPC's schedule only changes every game hour or so, so the same block is rebuilt for many movement decisions.
+    # With a single rule shown, the block is one template; no per-line list/join is needed.
+    target_name_str = f"'{target_name}'" if target_name else ""
+    target_pos_str = _format_coords(target_x, target_y) if target_x is not None else ""
+    if target_name_str and target_pos_str:
+        loc_info_str = f" at/near {target_name_str} / {target_pos_str}"
+    elif target_name_str or target_pos_str:
+        loc_info_str = f" at/near {target_name_str or target_pos_str}"
+    else:
+        loc_info_str = ""
+    mandatory_str = "MANDATORY:" if is_mandatory else "Preferred:"
+    more_rules_str = "\n- (...and more rules.)" if has_more_rules else ""
+    return f"\n--- Current Schedule ---\n- {mandatory_str} '{time_period_tag}': '{_truncate(activity_description, 50)}'{loc_info_str}.{more_rules_str}" # 縮短活動描述
 
 def _format_schedule_rules_for_prompt(schedule_rules: Optional[List[NPCScheduleRule]]) -> str:
     if not schedule_rules:
-        return "No specific schedule obligations currently."
+        return ""
 
-    lines = ["\n--- Current Schedule ---"]
     # *** 最多只顯示1條日程規則 ***
-    for rule in schedule_rules[:1]: 
-        loc_info_parts = []
-        if rule.target_location_name_or_area:
-            loc_info_parts.append(f"'{rule.target_location_name_or_area}'")
-        if rule.target_position:
-            loc_info_parts.append(f"({rule.target_position.x:.0f},{rule.target_position.y:.0f})")
-
-        loc_info_str = " at/near " + " / ".join(loc_info_parts) if loc_info_parts else ""
-        mandatory_str = "MANDATORY:" if rule.is_mandatory else "Preferred:"
-        lines.append(f"- {mandatory_str} '{rule.time_period_tag}': '{rule.activity_description[:50]}{'...' if len(rule.activity_description) > 50 else ''}'{loc_info_str}.") # 縮短活動描述
-    if len(schedule_rules) > 1: 
-        lines.append("- (...and more rules.)")
-    return "\n".join(lines)
+    rule = schedule_rules[0]
+    target_position = rule.target_position
+    return _format_schedule_rule_cached(
+        rule.time_period_tag, rule.activity_description, rule.target_location_name_or_area,
+        target_position.x if target_position else None, target_position.y if target_position else None,
+        rule.is_mandatory, len(schedule_rules) > 1
+    )
+
+# Per-item line templates, bound once so each listed entity/landmark is a single .format() call.
+_ENTITY_LINE = "- '{name}' ({entity_type}{significance}) at {coords}, dist {dist:.0f}.".format
+_LANDMARK_LINE = "- '{name}'{type_info}{owner_info} at {coords}, dist {dist:.0f}.".format
 
 def _format_nearby_entities_for_prompt(entities: List[EntityContextInfo], npc_current_pos: Position) -> str:
     if not entities:
-        return "No other characters nearby."
+        return ""
 
     lines = ["\n--- Nearby Characters (Closest First) ---"]
-    sorted_entities = sorted(entities, key=lambda entity_item: npc_current_pos.distance_to(Position(x=entity_item.x, y=entity_item.y)))
-    
-    for i, entity in enumerate(sorted_entities[:MAX_NEARBY_ENTITIES_TO_LIST]):
-        significance = " (important to you)" if entity.is_significant_to_npc else ""
-        dist = npc_current_pos.distance_to(Position(x=entity.x, y=entity.y))
-        lines.append(f"- '{entity.name or entity.npc_id}' ({entity.entity_type}{significance}) at ({entity.x:.0f},{entity.y:.0f}), dist {dist:.0f}.")
-
-    if len(sorted_entities) > MAX_NEARBY_ENTITIES_TO_LIST:
-        lines.append(f"- (...and {len(sorted_entities) - MAX_NEARBY_ENTITIES_TO_LIST} other(s) further away.)")
+    # Score each entity once by squared distance; nsmallest keeps only the top-K instead of sorting everything.
+    npc_x, npc_y = npc_current_pos.x, npc_current_pos.y
+    entity_count = len(entities)
+    scored_entities = [((entity.x - npc_x) ** 2 + (entity.y - npc_y) ** 2, entity) for entity in entities]
+    if entity_count <= MAX_NEARBY_ENTITIES_TO_LIST: # Everything gets listed, so a plain sort is all that's needed.
+        scored_entities.sort(key=lambda scored: scored[0])
+        closest_entities = scored_entities
+    else:
+        closest_entities = heapq.nsmallest(MAX_NEARBY_ENTITIES_TO_LIST, scored_entities, key=lambda scored: scored[0])
+
+    for sq_dist, entity in closest_entities:
+        lines.append(_ENTITY_LINE(
+            name=entity.name or entity.npc_id,
+            entity_type=entity.entity_type,
+            significance=" (important to you)" if entity.is_significant_to_npc else "",
+            coords=_format_coords(entity.x, entity.y),
+            dist=sq_dist ** 0.5
+        ))
+
+    if entity_count > MAX_NEARBY_ENTITIES_TO_LIST:
+        lines.append(f"- (...and {entity_count - MAX_NEARBY_ENTITIES_TO_LIST} other(s) further away.)")
     return "\n".join(lines)
 
 def _format_landmarks_for_prompt(landmarks: List[LandmarkContextInfo], npc_current_pos: Position, npc_info: NPCIdentifier) -> str:
     if not landmarks:
-        return "No significant landmarks detected nearby."
+        return ""
 
     lines = ["\n--- Nearby Landmarks (Closest First) ---"]
-    sorted_landmarks = sorted(landmarks, key=lambda l: npc_current_pos.distance_to(l.position))
+    npc_x, npc_y = npc_current_pos.x, npc_current_pos.y
+    # Read each nested position once; it feeds both the ranking and the output line.
+    landmark_coords = [(landmark.position.x, landmark.position.y) for landmark in landmarks]
+    landmark_count = len(landmarks)
+    scored_landmarks = [((lx - npc_x) ** 2 + (ly - npc_y) ** 2, ((lx, ly), landmark)) for (lx, ly), landmark in zip(landmark_coords, landmarks)]
+    if landmark_count <= MAX_LANDMARKS_TO_LIST:
+        scored_landmarks.sort(key=lambda scored: scored[0])
+        closest_landmarks = scored_landmarks
+    else:
+        closest_landmarks = heapq.nsmallest(MAX_LANDMARKS_TO_LIST, scored_landmarks, key=lambda scored: scored[0])
 
-    for i, landmark in enumerate(sorted_landmarks[:MAX_LANDMARKS_TO_LIST]):
-        type_info = f" ({landmark.landmark_type_tag})" if landmark.landmark_type_tag else ""
+    own_npc_id = npc_info.npc_id
+    for sq_dist, ((lx, ly), landmark) in closest_landmarks:
+        type_tag = landmark.landmark_type_tag
+        owner_id = landmark.owner_id
+        type_info = f" ({type_tag})" if type_tag else ""
         # *** 簡化 owner_info 和 entrance_info ***
         owner_info_str = ""
-        if landmark.owner_id:
-            owner_info_str = f" (Owner: {landmark.owner_id})" if landmark.owner_id != npc_info.npc_id else " (Your Room)"
+        if owner_id:
+            owner_info_str = f" (Owner: {owner_id})" if owner_id != own_npc_id else " (Your Room)"
         
-        dist = npc_current_pos.distance_to(landmark.position)
-        lines.append(f"- '{landmark.landmark_name}'{type_info}{owner_info_str} at ({landmark.position.x:.0f},{landmark.position.y:.0f}), dist {dist:.0f}.")
+        lines.append(_LANDMARK_LINE(
+            name=landmark.landmark_name, type_info=type_info, owner_info=owner_info_str,
+            coords=_format_coords(lx, ly), dist=sq_dist ** 0.5
+        ))
         
         # *** 暫時不輸出 current_status_notes 以大幅縮短提示詞 ***
         # critical_status_notes = []
@@ -161,109 +285,72 @@ def _format_landmarks_for_prompt(landmarks: List[LandmarkContextInfo], npc_curre
         # if critical_status_notes:
         #          lines.append(f"  Notes: {'; '.join(critical_status_notes)}")
 
-    if len(sorted_landmarks) > MAX_LANDMARKS_TO_LIST:
-        lines.append(f"- (...and {len(sorted_landmarks) - MAX_LANDMARKS_TO_LIST} other landmarks further away.)")
+    if landmark_count > MAX_LANDMARKS_TO_LIST:
+        lines.append(f"- (...and {landmark_count - MAX_LANDMARKS_TO_LIST} other landmarks further away.)")
     return "\n".join(lines)
 
+def _ensure_aware(value: Union[str, datetime]) -> datetime:
+    """
+    Returns `value` as a timezone-aware datetime, assuming UTC when naive.
+    Datetimes (the normal, Pydantic-validated case) skip parsing; strings are read as ISO 8601, accepting a trailing 'Z'.
+    """
+    parsed_dt = value if isinstance(value, datetime) else datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return parsed_dt if parsed_dt.tzinfo is not None else parsed_dt.replace(tzinfo=timezone.utc)
+
+# "Time ago" buckets as a lookup table: bisect on the upper bounds picks the (divisor, format) pair.
+_TIME_AGO_BOUNDS: Final[Tuple[int, ...]] = (120, 3600 * 2)
+_TIME_AGO_BUCKETS: Final[Tuple[Tuple[Optional[int], str], ...]] = ((60, "~{} min ago"), (3600, "~{} hr ago"), (None, "earlier"))
+
+def _format_time_ago(time_diff_seconds: float) -> str:
+    divisor, time_ago_format = _TIME_AGO_BUCKETS[bisect_right(_TIME_AGO_BOUNDS, time_diff_seconds)]
+    return time_ago_format.format(int(time_diff_seconds / divisor)) if divisor else time_ago_format
+
 def _format_location_history_for_prompt(history: List[VisitedLocationEntry], current_game_time_obj: GameTime) -> str:
     if not history or MAX_LOCATION_HISTORY_TO_LIST == 0: # Check if we should skip based on new constant
-        return "Recent location history not considered for this decision." if MAX_LOCATION_HISTORY_TO_LIST == 0 else "No recent location visits noted."
+        return ""
 
-    current_game_datetime = current_game_time_obj.current_timestamp
-    if not isinstance(current_game_datetime, datetime):
-        try: 
-            parsed_dt = datetime.fromisoformat(str(current_game_datetime).replace("Z", "+00:00"))
-            if parsed_dt.tzinfo is None or parsed_dt.tzinfo.utcoffset(parsed_dt) is None:
-                current_game_datetime = parsed_dt.replace(tzinfo=timezone.utc)
-            else:
-                current_game_datetime = parsed_dt
-        except (TypeError, ValueError) as e:
-            logger.error(f"Error parsing current_game_time.current_timestamp '{current_game_time_obj.current_timestamp}': {e}")
-            return "Recent location history unavailable due to time parsing issue."
+    try: 
+        current_epoch_s = _ensure_aware(current_game_time_obj.current_timestamp).timestamp()
+    except (TypeError, ValueError) as e:
+        logger.error(f"Error parsing current_game_time.current_timestamp '{current_game_time_obj.current_timestamp}': {e}")
+        return "Recent location history unavailable due to time parsing issue."
 
     lines = ["\n--- Recent Location Visits (Newest First) ---"]
-    for entry in sorted(history, key=lambda e_item: e_item.timestamp_visited, reverse=True)[:MAX_LOCATION_HISTORY_TO_LIST]:
-        entry_datetime = entry.timestamp_visited
-        if not isinstance(entry_datetime, datetime):
-            try: 
-                parsed_entry_dt = datetime.fromisoformat(str(entry_datetime).replace("Z", "+00:00"))
-                if parsed_entry_dt.tzinfo is None or parsed_entry_dt.tzinfo.utcoffset(parsed_entry_dt) is None:
-                    entry_datetime = parsed_entry_dt.replace(tzinfo=timezone.utc)
-                else:
-                    entry_datetime = parsed_entry_dt
-            except (TypeError, ValueError) as e_parse:
-                 logger.warning(f"Could not parse entry.timestamp_visited '{entry.timestamp_visited}' as datetime: {e_parse}")
-                 lines.append(f"- Visited ({entry.x:.0f},{entry.y:.0f}) at an unparsed time.")
-                 continue
-        
-        if entry_datetime.tzinfo is None and current_game_datetime.tzinfo is not None:
-            entry_datetime = entry_datetime.replace(tzinfo=current_game_datetime.tzinfo) 
-        elif entry_datetime.tzinfo is not None and current_game_datetime.tzinfo is None:
-             logger.warning("Comparing aware location timestamp with naive current game time.")
-
-        time_diff_seconds = (current_game_datetime - entry_datetime).total_seconds()
-        time_diff_seconds = max(0, time_diff_seconds)
-
-        if time_diff_seconds < 120: time_ago_str = f"~{int(time_diff_seconds / 60)} min ago"
-        elif time_diff_seconds < 3600 * 2 : time_ago_str = f"~{int(time_diff_seconds / 3600)} hr ago"
-        else: time_ago_str = "earlier"
-        lines.append(f"- Visited ({entry.x:.0f},{entry.y:.0f}) {time_ago_str}.")
-    if len(history) > MAX_LOCATION_HISTORY_TO_LIST:
+    history_count = len(history)
+    if history_count <= MAX_LOCATION_HISTORY_TO_LIST:
+        recent_entries = sorted(history, key=lambda e_item: e_item.timestamp_visited, reverse=True)
+    else:
+        recent_entries = heapq.nlargest(MAX_LOCATION_HISTORY_TO_LIST, history, key=lambda e_item: e_item.timestamp_visited)
+    for entry in recent_entries:
+        try: 
+            entry_epoch_s = _ensure_aware(entry.timestamp_visited).timestamp()
+        except (TypeError, ValueError) as e_parse:
+            logger.warning(f"Could not parse entry.timestamp_visited '{entry.timestamp_visited}' as datetime: {e_parse}")
+            lines.append(f"- Visited {_format_coords(entry.x, entry.y)} at an unparsed time.")
+            continue
+
+        # Epoch-second floats: one subtraction per entry instead of a timedelta allocation.
+        time_diff_seconds = max(0.0, current_epoch_s - entry_epoch_s)
+
+        lines.append(f"- Visited {_format_coords(entry.x, entry.y)} {_format_time_ago(time_diff_seconds)}.")
+    if history_count > MAX_LOCATION_HISTORY_TO_LIST:
         lines.append(f"- (...and more prior visits.)")
     return "\n".join(lines)
 
 def _format_long_term_memories_for_prompt(memories: Optional[List[LongTermMemoryEntry]]) -> str:
     if not memories or MAX_LTM_TO_LIST_IN_PROMPT == 0: # Check if we should skip
-        return "Long-term memories not considered for this decision." if MAX_LTM_TO_LIST_IN_PROMPT == 0 else "No specific long-term memories seem immediately relevant."
+        return ""
         
     lines = ["\n--- Relevant Long-Term Memories ---"]
     for i, mem in enumerate(memories[:MAX_LTM_TO_LIST_IN_PROMPT]):
-        lines.append(f"Memory ({mem.memory_type_tag}): \"{mem.content_text[:50]}{'...' if len(mem.content_text) > 50 else ''}\"") # *** 再縮短 ***
+        lines.append(f"Memory ({mem.memory_type_tag}): \"{_truncate(mem.content_text, 50)}\"") # *** 再縮短 ***
 
     if len(memories) > MAX_LTM_TO_LIST_IN_PROMPT:
         lines.append(f"  (...and {len(memories) - MAX_LTM_TO_LIST_IN_PROMPT} more.)")
     return "\n".join(lines)
 
-def build_npc_movement_decision_prompt(
-    npc_info: NPCIdentifier,
-    personality_description: str,
-    current_position: Position,
-    game_time: GameTime,
-    emotional_state: NPCEmotionalState,
-    active_schedule_rules: Optional[List[NPCScheduleRule]],
-    other_entities_nearby: List[EntityContextInfo],
-    visible_landmarks: List[LandmarkContextInfo],
-    scene_boundaries: SceneBoundaryInfo,
-    short_term_location_history: List[VisitedLocationEntry],
-    relevant_long_term_memories: Optional[List[LongTermMemoryEntry]],
-    recent_dialogue_summary: Optional[str],
-    explicit_player_movement_request: Optional[Position]
-) -> str:
-    prompt_components = [
-        f"You are '{npc_info.name or npc_info.npc_id}' (ID: {npc_info.npc_id}) in a shared apartment.",
-        f"Personality: \"{personality_description[:100]}{'...' if len(personality_description) > 100 else ''}\"", # *** 大幅縮短 ***
-        _format_current_time_for_prompt(game_time),
-        _format_emotional_state_for_prompt(emotional_state),
-        _format_schedule_rules_for_prompt(active_schedule_rules),
-    ]
-
-    prompt_components.extend([
-        f"\nCurrent Pos: ({current_position.x:.1f},{current_position.y:.1f}). Bounds: X({scene_boundaries.min_x:.0f} to {scene_boundaries.max_x:.0f}), Y({scene_boundaries.min_y:.0f} to {scene_boundaries.max_y:.0f}). Buffer: {settings.SCENE_BOUNDARY_BUFFER:.1f}.",
-        _format_location_history_for_prompt(short_term_location_history, game_time),
-        f"REVISIT RULE: AVOID targets within {settings.VISIT_THRESHOLD_DISTANCE:.1f} units of recent visits (last ~{settings.REVISIT_INTERVAL_SECONDS // 60} min) UNLESS compelling reason (schedule, player request, strong emotion, or specific social goal).",
-        _format_nearby_entities_for_prompt(other_entities_nearby, current_position),
-        _format_landmarks_for_prompt(visible_landmarks, current_position, npc_info),
-    ])
-
-    prompt_components.append(_format_long_term_memories_for_prompt(relevant_long_term_memories))
-
-    if recent_dialogue_summary: 
-        prompt_components.append(f"\nContext/Dialogue/Prior Failures/Intent: \"{recent_dialogue_summary[:100]}{'...' if len(recent_dialogue_summary) > 100 else ''}\"") # *** 大幅縮短 ***
-
-    if explicit_player_movement_request:
-        prompt_components.append(f"Player Request: Go near ({explicit_player_movement_request.x:.0f},{explicit_player_movement_request.y:.0f}). Consider if reasonable & respects rules.")
-
-    prompt_components.append(f"""
+# Static trailer blocks of the movement prompt, built once at import instead of per request.
+_SOCIAL_CONSIDERATIONS_BLOCK: Final[str] = """
 \n--- Social Considerations & Opportunities ---
 - You are a resident in a shared apartment. Being social is natural.
 - If in a common area (e.g., 'Living Room', 'Kitchen') and you see a known character nearby who doesn't seem busy, consider initiating a short conversation.
@@ -272,17 +359,25 @@ def build_npc_movement_decision_prompt(
     - 'chosen_action' should state this (e.g., "Go chat with [NPC Name]").
     - 'target_coordinates' should be near that NPC, respecting personal space.
     - Set 'social_interaction_considered' to Yes in priority_analysis.
-""")
+"""
 
-    prompt_components.append(f"""
+# Refers to "your ID" rather than the NPC's ID so the block is identical for every NPC.
+_ACCESS_RULES_BLOCK: Final[str] = """
 \n--- Apartment Access Rules (CRITICAL - MUST BE FOLLOWED) ---
 1.  Toilet ('bathroom' type): Enter only if its status is NOT 'OCCUPIED BY OTHER'. If occupied and you need to use it, action should be 'Wait near [Bathroom Name]', target a valid waiting spot.
-2.  Private Room ('bedroom' type): If NOT your room (owner_id != {npc_info.npc_id}), enter only if status is 'OWNER PRESENT'. AVOID if 'OWNER ABSENT'. Your own room is free to enter.
+2.  Private Room ('bedroom' type): If NOT your room (owner_id != your ID), enter only if status is 'OWNER PRESENT'. AVOID if 'OWNER ABSENT'. Your own room is free to enter.
 3.  No physical doors. Movement is via clear passages.
 4.  Avoid targeting coordinates ON TOP of furniture. Aim for clear floor space.
-""")
+"""
+
+# Settings are fixed once the app has started, so the revisit rule is rendered once as well.
+_REVISIT_RULE_LINE: Final[str] = (
+    f"REVISIT RULE: AVOID targets within {settings.VISIT_THRESHOLD_DISTANCE:.1f} units of recent visits "
+    f"(last ~{settings.REVISIT_INTERVAL_SECONDS // 60} min) UNLESS compelling reason "
+    f"(schedule, player request, strong emotion, or specific social goal)."
+)
 
-    prompt_components.append(f"""
+_YAML_TASK_BLOCK: Final[str] = """
 \n--- YOUR TASK: Decide Action & Target (Strict YAML Output) ---
 Based on ALL info, your personality, state, and rules:
 1.  **Analyze Primary Drivers & Constraints:** Key factors? (Dialogue/Player Req/Intent? Schedule? Emotion? Social? Memory? Access Rules? Revisit Rule? Exploration?)
@@ -306,10 +401,101 @@ reasoning: |
 chosen_action: "[Your short, in-character action phrase here]"
 target_coordinates: "x=<float_value>, y=<float_value>"
 resulting_emotion_tag: "[Your new primary emotion tag or 'no_change']"
-```""")
-    final_prompt = "\n".join(prompt_components)
-    logger.debug(
-        f"Built NPC movement prompt for {npc_info.npc_id}. "
-        f"Prompt length: {len(final_prompt)} chars."
+```"""
+
+# Everything in the movement prompt that is the same for every NPC and every call. It is sent as the first system
+# message so consecutive requests share an identical prefix, which lets Ollama reuse its evaluated KV cache for it.
+_STATIC_MOVEMENT_INSTRUCTIONS: Final[str] = "\n".join([
+    _SOCIAL_CONSIDERATIONS_BLOCK,
+    _ACCESS_RULES_BLOCK,
+    _YAML_TASK_BLOCK,
+]).lstrip("\n")
+_STATIC_MOVEMENT_MESSAGE: Final[Message] = Message.model_construct(role=MessageRole.SYSTEM, content=_STATIC_MOVEMENT_INSTRUCTIONS)
+
+# The per-call part of the movement prompt as one str.format template, so a call is a single format() over the
+# pre-rendered dynamic sections. Section slots take _section() output: empty sections leave no line at all,
+# so the LLM is not fed "nothing here" placeholder tokens.
+_MOVEMENT_PROMPT_TEMPLATE: Final[str] = "\n".join([
+    "You are '{npc_display_name}' (ID: {npc_id}) in a shared apartment.",
+    "Personality: \"{personality}\"",
+    "{time_block}",
+    "{emotion_block}{schedule_block}",
+    "\nCurrent Pos: ({pos_x:.1f},{pos_y:.1f}). Bounds: X({min_x:.0f} to {max_x:.0f}), Y({min_y:.0f} to {max_y:.0f}). "
+    f"Buffer: {settings.SCENE_BOUNDARY_BUFFER:.1f}.{{history_block}}", # Settings are fixed at startup, so the buffer is baked into the template
+    _REVISIT_RULE_LINE + "{entities_block}{landmarks_block}{memories_block}{optional_context}", # optional_context lines carry their own leading newline
+])
+
+def _section(block: str) -> str:
+    """Puts a formatted section on its own line, or drops it entirely when the formatter had nothing to say."""
+    return "\n" + block if block else ""
+
+def _prefill_template(template: str, **blocks: str) -> str:
+    """Substitutes fixed text into named slots of a str.format template, leaving every other slot in place."""
+    for slot, block in blocks.items():
+        template = template.replace("{" + slot + "}", block.replace("{", "{{").replace("}", "}}"))
+    return template
+
+# An idle NPC (no schedule, entities, landmarks, history or memories) has no sections at all,
+# so they are dropped once here and the per-call work is just the identity/time/position slots.
+_IDLE_MOVEMENT_PROMPT_TEMPLATE: Final[str] = _prefill_template(
+    _MOVEMENT_PROMPT_TEMPLATE,
+    schedule_block="", history_block="", entities_block="", landmarks_block="", memories_block="",
+)
+
+def build_npc_movement_decision_prompt(
+    npc_info: NPCIdentifier,
+    personality_description: str,
+    current_position: Position,
+    game_time: GameTime,
+    emotional_state: NPCEmotionalState,
+    active_schedule_rules: Optional[List[NPCScheduleRule]],
+    other_entities_nearby: List[EntityContextInfo],
+    visible_landmarks: List[LandmarkContextInfo],
+    scene_boundaries: SceneBoundaryInfo,
+    short_term_location_history: List[VisitedLocationEntry],
+    relevant_long_term_memories: Optional[List[LongTermMemoryEntry]],
+    recent_dialogue_summary: Optional[str],
+    explicit_player_movement_request: Optional[Position]
+) -> List[Message]:
+    """
+    Returns the movement decision prompt as two system messages: the shared static instructions first,
+    then this NPC's context.
+    """
+    npc_id = npc_info.npc_id
+    npc_display_name = npc_info.name or npc_id
+
+    optional_context = ""
+    if recent_dialogue_summary: 
+        optional_context += f"\n\nContext/Dialogue/Prior Failures/Intent: \"{_truncate(recent_dialogue_summary, 100)}\"" # *** 大幅縮短 ***
+
+    if explicit_player_movement_request:
+        optional_context += f"\nPlayer Request: Go near {_format_coords(explicit_player_movement_request.x, explicit_player_movement_request.y)}. Consider if reasonable & respects rules."
+
+    prompt_fields = dict(
+        npc_id=npc_id,
+        npc_display_name=npc_display_name,
+        personality=_truncate(personality_description, 100), # *** 大幅縮短 ***
+        time_block=_format_current_time_for_prompt(game_time),
+        emotion_block=_format_emotional_state_for_prompt(emotional_state),
+        pos_x=current_position.x, pos_y=current_position.y,
+        min_x=scene_boundaries.min_x, max_x=scene_boundaries.max_x,
+        min_y=scene_boundaries.min_y, max_y=scene_boundaries.max_y,
+        optional_context=optional_context,
     )
-    return final_prompt
\ No newline at end of file
+    if not (active_schedule_rules or other_entities_nearby or visible_landmarks or short_term_location_history or relevant_long_term_memories):
+        final_prompt = _IDLE_MOVEMENT_PROMPT_TEMPLATE.format(**prompt_fields)
+    else:
+        final_prompt = _MOVEMENT_PROMPT_TEMPLATE.format(
+            schedule_block=_section(_format_schedule_rules_for_prompt(active_schedule_rules)),
+            history_block=_section(_format_location_history_for_prompt(short_term_location_history, game_time)),
+            entities_block=_section(_format_nearby_entities_for_prompt(other_entities_nearby, current_position)),
+            landmarks_block=_section(_format_landmarks_for_prompt(visible_landmarks, current_position, npc_info)),
+            memories_block=_section(_format_long_term_memories_for_prompt(relevant_long_term_memories)),
+            **prompt_fields
+        )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"Built NPC movement prompt for {npc_id}. "
+            f"Prompt length: {len(_STATIC_MOVEMENT_INSTRUCTIONS) + len(final_prompt)} chars."
+        )
+    return [_STATIC_MOVEMENT_MESSAGE, Message.model_construct(role=MessageRole.SYSTEM, content=final_prompt)]
\ No newline at end of file
@@ -1,19 +1,175 @@
 # npc_api_suite/app/llm/translators.py
 
-from typing import Optional, Dict, Any 
+from typing import Optional, Dict, Any, List, Tuple 
+from collections import OrderedDict
 from app.llm.ollama_client import OllamaService 
 from app.core.schemas import Message, OllamaChatOptions, default_aware_utcnow 
-from app.llm.prompt_builder import build_translation_prompt_messages 
+from app.llm.prompt_builder import build_translation_prompt_messages, build_batch_translation_prompt_messages 
 from app.core.config import settings_instance as settings 
 from app.core.logging_config import setup_logging 
+import hashlib
 import json 
+import logging
+import re
 import aiofiles 
 import asyncio 
 from datetime import datetime 
 
+try:
+    import orjson
+except ImportError: # Optional: faster translation log encoding, falls back to the json module
+    orjson = None
+
 logger = setup_logging(__name__)
 
-_TRANSLATION_LOG_LOCK = asyncio.Lock()
+# Translation log entries are queued by the translators and appended by a single background writer (started from
+# main.py's lifespan) that keeps the file open and writes in batches. A None entry tells the writer to finish.
+# When no writer is running (scripts, tests), entries are appended directly under the lock instead.
+# The queue and lock are asyncio primitives bound to one event loop, so they are created on the loop that uses them
+# (the queue per writer start, the lock per loop) rather than at import; a second lifespan or asyncio.run() gets fresh ones.
+_TRANSLATION_LOG_QUEUE_MAX_ENTRIES = 10_000
+_TRANSLATION_LOG_WRITE_BATCH = 256
+_TRANSLATION_LOG_THREAD_ENCODE_MIN = 32 # Batches at least this large are encoded in a worker thread, off the event loop
+_translation_log_queue: "Optional[asyncio.Queue[Optional[Dict[str, Any]]]]" = None
+_translation_log_writer_task: Optional[asyncio.Task] = None
+_translation_log_lock: Optional[asyncio.Lock] = None
+_translation_log_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+_dropped_translation_log_entries = 0
+
+def _get_translation_log_lock() -> asyncio.Lock:
+    """Returns the direct-append lock for the running event loop, creating it on first use in that loop."""
+    global _translation_log_lock, _translation_log_lock_loop
+    running_loop = asyncio.get_running_loop()
+    if _translation_log_lock is None or _translation_log_lock_loop is not running_loop:
+        _translation_log_lock = asyncio.Lock()
+        _translation_log_lock_loop = running_loop
+    return _translation_log_lock
+
+def _translation_log_writer_running() -> bool:
+    """True if a background writer is accepting entries on the running event loop."""
+    return (
+        _translation_log_writer_task is not None
+        and not _translation_log_writer_task.done()
+        and _translation_log_writer_task.get_loop() is asyncio.get_running_loop()
+    )
+
+def _encode_translation_log_entries(entries: List[Dict[str, Any]]) -> bytes:
+    """Encodes entries as UTF-8 JSON lines, ready for a binary-mode append."""
+    if orjson is not None:
+        return b"".join(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE) for entry in entries)
+    return "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode("utf-8")
+
+async def _append_translation_log_entries(entries: List[Dict[str, Any]]) -> None:
+    async with _get_translation_log_lock(): # The log directory is created at startup by config.ensure_directories_exist()
+        async with aiofiles.open(settings.TRANSLATION_LOG_FILE, mode='ab') as f:
+            await f.write(_encode_translation_log_entries(entries))
+
+async def _translation_log_writer(log_queue: "asyncio.Queue[Optional[Dict[str, Any]]]") -> None:
+    async with aiofiles.open(settings.TRANSLATION_LOG_FILE, mode='ab') as f:
+        stopping = False
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            entry = await log_queue.get()
+            while True:
+                if entry is None:
+                    stopping = True
+                else:
+                    batch.append(entry)
+                if len(batch) >= _TRANSLATION_LOG_WRITE_BATCH or log_queue.empty():
+                    break
+                entry = log_queue.get_nowait()
+            if not batch:
+                continue
+            try:
+                if len(batch) >= _TRANSLATION_LOG_THREAD_ENCODE_MIN:
+                    encoded_batch = await asyncio.to_thread(_encode_translation_log_entries, batch)
+                else:
+                    encoded_batch = _encode_translation_log_entries(batch)
+                await f.write(encoded_batch)
+                await f.flush()
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} entries to translation log file '{settings.TRANSLATION_LOG_FILE}': {e}", exc_info=True)
+
+def start_translation_log_writer() -> None:
+    """
+    Starts the background translation log writer, with a fresh queue, on the running event loop.
+    No-op if logging is disabled or a writer is already running on this loop.
+    """
+    global _translation_log_queue, _translation_log_writer_task, _dropped_translation_log_entries
+    if not settings.ENABLE_TRANSLATION_LOGGING or _translation_log_writer_running():
+        return
+    _translation_log_queue = asyncio.Queue(maxsize=_TRANSLATION_LOG_QUEUE_MAX_ENTRIES)
+    _dropped_translation_log_entries = 0
+    _translation_log_writer_task = asyncio.create_task(_translation_log_writer(_translation_log_queue))
+
+async def stop_translation_log_writer() -> None:
+    """Writes out everything still queued, then stops the background writer and discards its queue."""
+    global _translation_log_queue, _translation_log_writer_task
+    writer_task, log_queue = _translation_log_writer_task, _translation_log_queue
+    _translation_log_writer_task, _translation_log_queue = None, None # New entries go the direct-append path from here on
+    if writer_task is None or log_queue is None:
+        return
+    if writer_task.get_loop() is not asyncio.get_running_loop():
+        logger.warning("Translation log writer belongs to a different event loop and cannot be flushed from this one; discarding it.")
+        return
+    if not writer_task.done():
+        await log_queue.put(None)
+    try:
+        await writer_task
+    except Exception as e:
+        logger.error(f"Translation log writer stopped with an error: {e}", exc_info=True)
+    if _dropped_translation_log_entries:
+        logger.warning(f"{_dropped_translation_log_entries} translation log entries were dropped because the log queue was full.")
+
+# Batched translation: how many lines go into one LLM call, and how numbered output lines are read back.
+MAX_TRANSLATION_BATCH_SIZE = 8
+_NUMBERED_LINE_PATTERN = re.compile(r"^\s*(\d+)\s*[:.)]\s*(.*?)\s*$", re.MULTILINE)
+
+# Successful translations are reused for repeated lines; only safe because translation runs at low temperature.
+# Long texts rarely repeat, so they are not cached; keys ignore surrounding whitespace, which the output drops anyway.
+TRANSLATION_CACHE_MAX_ENTRIES = 2048
+TRANSLATION_CACHE_MAX_TEXT_LENGTH = 500
+_TRANSLATION_TEMPERATURE = 0.2
+
+# Ollama reloads the model runner whenever num_ctx changes between calls, so translation keeps one fixed context
+# and only steps up to a single larger one when the text would not fit. Options are read-only to the client
+# (it model_dumps them), so both instances are shared.
+# Fit estimate: ~3 chars per token, counted twice (input and translated output), plus room for the system prompt.
+_TRANSLATION_CTX = 1024
+_LARGE_TRANSLATION_CTX = 2048
+_TRANSLATION_CTX_OVERHEAD_TOKENS = 128
+_TRANSLATION_CHAT_OPTIONS = OllamaChatOptions(temperature=_TRANSLATION_TEMPERATURE, num_ctx=_TRANSLATION_CTX)
+_LARGE_TRANSLATION_CHAT_OPTIONS = OllamaChatOptions(temperature=_TRANSLATION_TEMPERATURE, num_ctx=_LARGE_TRANSLATION_CTX)
+
+_BATCH_LINE_PREFIX_CHARS = 4 # Each batched line gets a "<n>: " prefix
+
+def _estimated_translation_tokens(text_chars: int) -> int:
+    return (text_chars // 3) * 2 + _TRANSLATION_CTX_OVERHEAD_TOKENS
+
+def _translation_chat_options(text_chars: int) -> OllamaChatOptions:
+    return _TRANSLATION_CHAT_OPTIONS if _estimated_translation_tokens(text_chars) <= _TRANSLATION_CTX else _LARGE_TRANSLATION_CHAT_OPTIONS
+
+def _split_translation_batches(items: List[Tuple[int, str]]) -> List[List[Tuple[int, str]]]:
+    """
+    Groups (index, text) pairs into batches of at most MAX_TRANSLATION_BATCH_SIZE whose estimate still fits
+    _LARGE_TRANSLATION_CTX, so a batch never needs more context than the larger preset gives it.
+    """
+    batches: List[List[Tuple[int, str]]] = []
+    current_batch: List[Tuple[int, str]] = []
+    current_chars = 0
+    for item in items:
+        item_chars = len(item[1]) + _BATCH_LINE_PREFIX_CHARS
+        if current_batch and (
+            len(current_batch) >= MAX_TRANSLATION_BATCH_SIZE
+            or _estimated_translation_tokens(current_chars + item_chars) > _LARGE_TRANSLATION_CTX
+        ):
+            batches.append(current_batch)
+            current_batch, current_chars = [], 0
+        current_batch.append(item)
+        current_chars += item_chars
+    if current_batch:
+        batches.append(current_batch)
+    return batches
 
 class TextTranslatorService:
     """
@@ -26,6 +182,28 @@ class TextTranslatorService:
         Initializes the TextTranslatorService with an instance of OllamaService.
         """
         self.ollama_service = ollama_service
+        self._cache: "OrderedDict[Tuple[str, Optional[str], str, bytes], str]" = OrderedDict()
+
+    @staticmethod
+    def _is_cacheable(text: str) -> bool:
+        """False for texts longer than TRANSLATION_CACHE_MAX_TEXT_LENGTH (ignoring surrounding whitespace)."""
+        return len(text.strip()) <= TRANSLATION_CACHE_MAX_TEXT_LENGTH
+
+    @staticmethod
+    def _cache_key(model: str, source_language: Optional[str], target_language: str, text: str) -> Optional[Tuple[str, Optional[str], str, bytes]]:
+        """Returns None for texts too long to be worth caching; None is never a cache hit and is never stored."""
+        if not TextTranslatorService._is_cacheable(text):
+            return None
+        normalized_text = text.strip()
+        return (model, source_language, target_language, hashlib.blake2b(normalized_text.encode("utf-8"), digest_size=16).digest())
+
+    def _cache_store(self, key: Optional[Tuple[str, Optional[str], str, bytes]], translated_text: str) -> None:
+        if key is None:
+            return
+        self._cache[key] = translated_text
+        self._cache.move_to_end(key)
+        if len(self._cache) > TRANSLATION_CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
 
     async def _log_translation_attempt(
         self,
@@ -35,10 +213,12 @@ class TextTranslatorService:
         target_lang: str,
         model_used: str,
         success: bool,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        from_cache: bool = False
     ):
         """
-        Asynchronously logs the details of a translation attempt to a file.
+        Logs the details of a translation attempt to a file: queued for the background writer when it is running,
+        otherwise appended directly. Cache hits are logged too, marked with "from_cache": true.
         """
         if not settings.ENABLE_TRANSLATION_LOGGING:
             return
@@ -54,13 +234,19 @@ class TextTranslatorService:
         }
         if error_message:
             log_entry["error_message"] = error_message
+        if from_cache:
+            log_entry["from_cache"] = True
+
+        if _translation_log_queue is not None and _translation_log_writer_running():
+            try:
+                _translation_log_queue.put_nowait(log_entry)
+            except asyncio.QueueFull:
+                global _dropped_translation_log_entries
+                _dropped_translation_log_entries += 1
+            return
 
         try:
-            async with _TRANSLATION_LOG_LOCK:
-                # Ensure the directory exists (config.py should handle this on startup, but as a safeguard)
-                settings.TRANSLATION_LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-                async with aiofiles.open(settings.TRANSLATION_LOG_FILE, mode='a', encoding='utf-8') as f:
-                    await f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+            await _append_translation_log_entries([log_entry])
         except Exception as e:
             logger.error(f"Failed to write to translation log file '{settings.TRANSLATION_LOG_FILE}': {e}", exc_info=True)
 
@@ -92,6 +278,7 @@ class TextTranslatorService:
             return None
 
         effective_translation_model = translation_model_override or settings.DEFAULT_TRANSLATION_MODEL
+        original_preview = text_to_translate[:50] # Shared by every log line and error placeholder below
         
         # Prepare variables for logging
         translated_text_for_log: Optional[str] = None
@@ -107,7 +294,7 @@ class TextTranslatorService:
             logger.warning(warning_msg)
             log_error_message = "Translation unavailable: No model configured"
             # Do not assign to translated_text_for_log here, it should remain None for error cases
-            final_output_text = f"[{log_error_message}] Original: {text_to_translate[:50]}..."
+            final_output_text = f"[{log_error_message}] Original: {original_preview}..."
             # Log this attempt
             await self._log_translation_attempt(
                 original_text=text_to_translate,
@@ -120,6 +307,21 @@ class TextTranslatorService:
             )
             return final_output_text
 
+        cache_key = self._cache_key(effective_translation_model, source_language, target_language, text_to_translate)
+        cached_translation = self._cache.get(cache_key)
+        if cached_translation is not None:
+            self._cache.move_to_end(cache_key)
+            await self._log_translation_attempt(
+                original_text=text_to_translate,
+                translated_text=cached_translation,
+                source_lang=source_language,
+                target_lang=target_language,
+                model_used=effective_translation_model,
+                success=True,
+                from_cache=True
+            )
+            return cached_translation
+
         translation_messages = build_translation_prompt_messages(
             text_to_translate=text_to_translate,
             target_language=target_language,
@@ -127,59 +329,62 @@ class TextTranslatorService:
         )
         
         try:
-            logger.debug(f"Attempting translation from '{source_language}' to '{target_language}' "
-                         f"for text: '{text_to_translate[:70]}...' using model '{effective_translation_model}'")
-            
-            chat_options = OllamaChatOptions(temperature=0.2, num_ctx=1024) # Example options
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Attempting translation from '{source_language}' to '{target_language}' "
+                             f"for text: '{text_to_translate[:70]}...' using model '{effective_translation_model}'")
             
             ollama_response_data = await self.ollama_service.generate_chat_completion(
                 model=effective_translation_model,
                 messages=translation_messages,
                 stream=False,
-                options=chat_options 
+                options=_translation_chat_options(len(text_to_translate)) 
             )
             
             if isinstance(ollama_response_data, dict) and ollama_response_data.get("error"):
                 llm_error = ollama_response_data.get("message", {}).get("content", ollama_response_data["error"])
                 logger.error(f"LLM client returned error for translation with model '{effective_translation_model}': {llm_error}")
                 log_error_message = f"LLM Client Error: {llm_error}"
-                final_output_text = f"[Translation Error: {log_error_message}] Original: {text_to_translate[:50]}..."
+                final_output_text = f"[Translation Error: {log_error_message}] Original: {original_preview}..."
             elif isinstance(ollama_response_data, dict) and "message" in ollama_response_data and isinstance(ollama_response_data["message"], dict):
                 translated_content = ollama_response_data.get('message', {}).get('content')
                 if translated_content:
                     final_output_text = translated_content.strip()
                     translated_text_for_log = final_output_text # Store for logging successful translation
                     log_success_status = True
-                    logger.info(f"Successfully translated to '{target_language}': '{final_output_text[:70]}...' (Original: '{text_to_translate[:50]}...')")
+                    self._cache_store(cache_key, final_output_text)
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(f"Successfully translated to '{target_language}': '{final_output_text[:70]}...' (Original: '{original_preview}...')")
                 else:
                     log_error_message = "Empty Response from LLM"
-                    logger.warning(
-                        f"Translation attempt for '{text_to_translate[:50]}...' to '{target_language}' "
-                        f"using model '{effective_translation_model}' returned empty or no content. "
-                        f"Full Ollama response: {str(ollama_response_data)[:200]}..."
-                    )
-                    final_output_text = f"[Translation Error: {log_error_message}] Original: {text_to_translate[:50]}..."
+                    if logger.isEnabledFor(logging.WARNING): # Skip stringifying the whole response when filtered
+                        logger.warning(
+                            f"Translation attempt for '{original_preview}...' to '{target_language}' "
+                            f"using model '{effective_translation_model}' returned empty or no content. "
+                            f"Full Ollama response: {str(ollama_response_data)[:200]}..."
+                        )
+                    final_output_text = f"[Translation Error: {log_error_message}] Original: {original_preview}..."
             else:
                 log_error_message = "Invalid response structure from LLM client"
-                logger.error(f"Unexpected response structure from ollama_service for translation: {str(ollama_response_data)[:300]}")
-                final_output_text = f"[Translation Error: {log_error_message}] Original: {text_to_translate[:50]}..."
+                if logger.isEnabledFor(logging.ERROR):
+                    logger.error(f"Unexpected response structure from ollama_service for translation: {str(ollama_response_data)[:300]}")
+                final_output_text = f"[Translation Error: {log_error_message}] Original: {original_preview}..."
 
         except ConnectionError as e: 
             log_error_message = f"Ollama Connection Error: {str(e)}"
             logger.error(f"Ollama connection error during translation: {e}", exc_info=True)
-            final_output_text = f"[Translation Failed: Ollama Connection Error] Original: {text_to_translate[:50]}..."
+            final_output_text = f"[Translation Failed: Ollama Connection Error] Original: {original_preview}..."
         except ValueError as ve: # Catch ValueErrors, e.g. from model name issue in ollama_client
             log_error_message = f"ValueError during translation: {str(ve)}"
             logger.error(f"ValueError during translation process for model '{effective_translation_model}': {ve}", exc_info=True)
-            final_output_text = f"[Translation Failed: Configuration or Value Error] Original: {text_to_translate[:50]}..."
+            final_output_text = f"[Translation Failed: Configuration or Value Error] Original: {original_preview}..."
         except Exception as e:
             log_error_message = f"Unexpected error: {type(e).__name__} - {str(e)}"
             logger.error(
-                f"An unexpected error occurred during LLM translation of '{text_to_translate[:50]}...' "
+                f"An unexpected error occurred during LLM translation of '{original_preview}...' "
                 f"to '{target_language}' using model '{effective_translation_model}': {e}",
                 exc_info=True
             )
-            final_output_text = f"[Translation Failed: {type(e).__name__}] Original: {text_to_translate[:50]}..."
+            final_output_text = f"[Translation Failed: {type(e).__name__}] Original: {original_preview}..."
         
         finally:
             # Log the translation attempt using the status determined within the try block
@@ -193,4 +398,148 @@ class TextTranslatorService:
                 error_message=log_error_message # This will have the error if not successful
             )
 
-        return final_output_text
\ No newline at end of file
+        return final_output_text
+
+    async def translate_texts(
+        self,
+        texts_to_translate: List[str],
+        target_language: str = "Traditional Chinese",
+        source_language: Optional[str] = "English",
+        translation_model_override: Optional[str] = None,
+        max_concurrency: Optional[int] = None
+    ) -> List[Optional[str]]:
+        """
+        Translates several texts, packing up to MAX_TRANSLATION_BATCH_SIZE single-line texts into one LLM call,
+        as long as the batch still fits the larger translation context.
+        Results are returned in input order with the same conventions as translate_text (None for empty input,
+        a bracketed placeholder on failure). Multi-line texts, texts longer than TRANSLATION_CACHE_MAX_TEXT_LENGTH,
+        lone texts, and any batch whose numbered output cannot be matched back to its inputs go through
+        translate_text one by one.
+        Batches, and then the one-by-one texts, run concurrently with at most max_concurrency
+        (default settings.TRANSLATION_MAX_CONCURRENCY) requests in flight.
+        Repeated texts (ignoring surrounding whitespace) are translated once and share the result.
+        """
+        results: List[Optional[str]] = [None] * len(texts_to_translate)
+        batchable: List[Tuple[int, str]] = []
+        single: List[Tuple[int, str]] = []
+        first_index_by_text: Dict[str, int] = {}
+        duplicate_indices: Dict[int, List[int]] = {}
+        effective_translation_model = translation_model_override or settings.DEFAULT_TRANSLATION_MODEL
+        for index, text in enumerate(texts_to_translate):
+            if not text or not text.strip():
+                continue
+            normalized_text = text.strip()
+            first_index = first_index_by_text.setdefault(normalized_text, index)
+            if first_index != index:
+                duplicate_indices.setdefault(first_index, []).append(index)
+                continue
+            # Multi-line, long and cached texts are safer or cheaper through translate_text
+            if "\n" in normalized_text or not self._is_cacheable(text):
+                single.append((index, text))
+            elif effective_translation_model and self._cache_key(effective_translation_model, source_language, target_language, text) in self._cache:
+                single.append((index, text))
+            else:
+                batchable.append((index, text))
+
+        semaphore = asyncio.Semaphore(max_concurrency or settings.TRANSLATION_MAX_CONCURRENCY or 1)
+
+        async def _run_batch(batch: List[Tuple[int, str]]) -> Optional[List[str]]:
+            if len(batch) < 2:
+                return None
+            async with semaphore:
+                return await self._translate_batch([text for _, text in batch], target_language, source_language, translation_model_override)
+
+        batches = _split_translation_batches(batchable)
+        for batch, batch_translations in zip(batches, await asyncio.gather(*(_run_batch(batch) for batch in batches))):
+            if batch_translations is None:
+                single.extend(batch)
+                continue
+            for (index, _), translated in zip(batch, batch_translations):
+                results[index] = translated
+
+        single_translations = await self.translate_many(
+            [(text, source_language, target_language) for _, text in single],
+            translation_model_override=translation_model_override,
+            max_concurrency=max_concurrency
+        )
+        for (index, _), translated in zip(single, single_translations):
+            results[index] = translated
+        for first_index, later_indices in duplicate_indices.items():
+            for index in later_indices:
+                results[index] = results[first_index]
+        return results
+
+    async def _translate_batch(
+        self,
+        texts: List[str],
+        target_language: str,
+        source_language: Optional[str],
+        translation_model_override: Optional[str]
+    ) -> Optional[List[str]]:
+        """One LLM call for a numbered batch. Returns None (caller falls back to single calls) on any error or mismatch."""
+        effective_translation_model = translation_model_override or settings.DEFAULT_TRANSLATION_MODEL
+        if not effective_translation_model:
+            return None
+
+        try:
+            ollama_response_data = await self.ollama_service.generate_chat_completion(
+                model=effective_translation_model,
+                messages=build_batch_translation_prompt_messages(texts, target_language, source_language),
+                stream=False,
+                options=_translation_chat_options(sum(len(text) + _BATCH_LINE_PREFIX_CHARS for text in texts))
+            )
+        except Exception as e:
+            logger.warning(f"Batched translation of {len(texts)} texts with model '{effective_translation_model}' failed, falling back to single calls: {e}")
+            return None
+
+        content = ""
+        if isinstance(ollama_response_data, dict) and not ollama_response_data.get("error"):
+            message = ollama_response_data.get("message")
+            if isinstance(message, dict):
+                content = message.get("content") or ""
+        translations_by_number = {int(number): translated for number, translated in _NUMBERED_LINE_PATTERN.findall(content) if translated}
+        if any(line_number not in translations_by_number for line_number in range(1, len(texts) + 1)):
+            logger.warning(f"Batched translation of {len(texts)} texts returned unparseable output, falling back to single calls.")
+            return None
+
+        translations = [translations_by_number[line_number] for line_number in range(1, len(texts) + 1)]
+        for original_text, translated in zip(texts, translations):
+            self._cache_store(self._cache_key(effective_translation_model, source_language, target_language, original_text), translated)
+            await self._log_translation_attempt(
+                original_text=original_text,
+                translated_text=translated,
+                source_lang=source_language,
+                target_lang=target_language,
+                model_used=effective_translation_model,
+                success=True
+            )
+        return translations
+
+    async def translate_many(
+        self,
+        items: List[Tuple[str, Optional[str], str]],
+        translation_model_override: Optional[str] = None,
+        max_concurrency: Optional[int] = None
+    ) -> List[Optional[str]]:
+        """
+        Translates (text, source_language, target_language) items concurrently, for callers whose items do not
+        share one language pair (use translate_texts when they do). At most max_concurrency (default
+        settings.TRANSLATION_MAX_CONCURRENCY) requests are in flight at once. Results keep input order.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or settings.TRANSLATION_MAX_CONCURRENCY or 1)
+
+        async def _translate_one(text: str, source_language: Optional[str], target_language: str) -> Optional[str]:
+            async with semaphore:
+                return await self.translate_text(
+                    text_to_translate=text,
+                    target_language=target_language,
+                    source_language=source_language,
+                    translation_model_override=translation_model_override
+                )
+
+        outcomes = await asyncio.gather(*(_translate_one(*item) for item in items), return_exceptions=True)
+        # translate_text reports its own failures as placeholders; anything escaping it is reported the same way.
+        return [
+            f"[Translation Failed: {type(outcome).__name__}] Original: {text[:50]}..." if isinstance(outcome, BaseException) else outcome
+            for (text, _, _), outcome in zip(items, outcomes)
+        ]
@@ -1,19 +1,29 @@
 # npc_api_suite/app/main.py
 
 from fastapi import FastAPI, Request, status, HTTPException as FastAPIHTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
+import logging
+import secrets # For request ID in middleware
 import time
-import uuid # For request ID in middleware example
+from typing import Optional
 import ollama # For ollama.ResponseError type hinting
 
+try:
+    import orjson # ORJSONResponse needs it; serializes responses several times faster when installed
+    _DefaultResponseClass = ORJSONResponse
+except ImportError:
+    _DefaultResponseClass = JSONResponse
+
 # --- Core Application Imports ---
 from app.core.config import settings_instance as settings
 from app.core.logging_config import main_app_logger # Use the pre-configured main app logger
 from app.llm.ollama_client import OllamaService
+from app.llm.translators import start_translation_log_writer, stop_translation_log_writer
 from app.core.schemas import ( # Import necessary Pydantic models for responses
-    HealthStatusResponse, APIErrorResponse, APIErrorDetail
+    HealthStatusResponse
 )
 # Import service needed for shutdown hook
 from app.services.npc_memory_service import save_all_dirty_npc_memories
@@ -28,8 +38,8 @@ from app.routers import admin as router_admin
 async def lifespan(app_instance: FastAPI):
     """
     Manages application startup and shutdown events.
-    - Initializes Ollama client on startup.
-    - Saves dirty NPC memories and closes Ollama client on shutdown.
+    - Initializes Ollama client and starts the translation log writer on startup.
+    - Saves dirty NPC memories, flushes the translation log and closes Ollama client on shutdown.
     """
     main_app_logger.info(f"----- Starting up {settings.API_TITLE} v{settings.API_VERSION} -----")
     main_app_logger.info(f"Server Host: {settings.SERVER_HOST}, Port: {settings.SERVER_PORT}")
@@ -49,6 +59,8 @@ async def lifespan(app_instance: FastAPI):
         # For now, it will run but Ollama calls will fail.
     else:
         main_app_logger.info("Ollama Client initialized and connection verified successfully.")
+
+    start_translation_log_writer()
     
     # --- Application is now running ---
     yield
@@ -62,6 +74,8 @@ async def lifespan(app_instance: FastAPI):
             main_app_logger.info("Finished saving outstanding NPC memories.")
         except Exception as e_mem_save:
             main_app_logger.error(f"Error during shutdown save of NPC memories: {e_mem_save}", exc_info=True)
+
+    await stop_translation_log_writer()
             
     await OllamaService.close_client()
     main_app_logger.info("Ollama Client has been closed.")
@@ -73,6 +87,7 @@ app = FastAPI(
     description=settings.API_DESCRIPTION,
     version=settings.API_VERSION,
     lifespan=lifespan, # Register the lifespan context manager
+    default_response_class=_DefaultResponseClass,
     #openapi_url="/api/v1/openapi.json", # Optional: customize OpenAPI spec URL
     #docs_url="/documentation", # Optional: customize Swagger UI URL
     #redoc_url="/redoc", # Optional: customize ReDoc URL
@@ -94,11 +109,12 @@ if settings.ENABLE_CORS:
 # Middleware to add X-Request-ID and X-Process-Time-Ms headers
 @app.middleware("http")
 async def http_request_middleware(request: Request, call_next):
-    request_id = str(uuid.uuid4())
+    request_id = secrets.token_hex(8) # 16 hex chars: plenty for log correlation, cheaper than building a UUID
     request.state.request_id = request_id # Make request_id available to route handlers if needed
 
     start_time = time.perf_counter()
-    main_app_logger.debug(f"Request ID: {request_id} - START {request.method} {request.url.path}")
+    if main_app_logger.isEnabledFor(logging.DEBUG):
+        main_app_logger.debug(f"Request ID: {request_id} - START {request.method} {request.url.path}")
 
     response = await call_next(request) # Process the request
 
@@ -106,23 +122,36 @@ async def http_request_middleware(request: Request, call_next):
     response.headers["X-Process-Time-Ms"] = f"{process_time_ms:.3f}"
     response.headers["X-Request-ID"] = request_id
     
-    main_app_logger.info(
-        f"Request ID: {request_id} - END {request.method} {request.url.path} - Status: {response.status_code} - Processed in: {process_time_ms:.3f}ms"
-    )
+    if main_app_logger.isEnabledFor(logging.INFO):
+        main_app_logger.info(
+            f"Request ID: {request_id} - END {request.method} {request.url.path} - Status: {response.status_code} - Processed in: {process_time_ms:.3f}ms"
+        )
     return response
 
 # --- Global Exception Handlers ---
 
+# Error bodies follow the APIErrorResponse schema but are built as plain dicts, skipping a Pydantic validate + dump per error.
+def _error_response(status_code: int, message: str, error_code: str, headers=None) -> Response:
+    return _DefaultResponseClass(
+        status_code=status_code,
+        content={"error": {"error_code": error_code, "message": message, "context_info": None}},
+        headers=headers
+    )
+
+# The 500 body only varies by request ID (hex or 'N/A', never needing JSON escaping), so it is spliced into fixed bytes.
+_UNHANDLED_ERROR_BODY_PREFIX = b'{"error":{"error_code":"UNHANDLED_SERVER_ERROR","message":"An unexpected internal server error occurred. Ref ID: '
+_UNHANDLED_ERROR_BODY_SUFFIX = b'","context_info":null}}'
+
 @app.exception_handler(FastAPIHTTPException) # Handles exceptions raised by FastAPI itself or our code (raise HTTPException)
 async def custom_fastapi_http_exception_handler(request: Request, exc: FastAPIHTTPException):
     request_id = getattr(request.state, 'request_id', 'N/A')
-    main_app_logger.warning(
-        f"Request ID: {request_id} - FastAPIHTTPException: Status={exc.status_code}, Detail='{exc.detail}' for {request.method} {request.url.path}",
-        exc_info=False # Typically, HTTPException details are sufficient, no full stack trace needed unless debugging
-    )
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=APIErrorResponse(error=APIErrorDetail(message=exc.detail, error_code=f"HTTP_{exc.status_code}")).model_dump(),
+    if main_app_logger.isEnabledFor(logging.WARNING): # The common error path (4xx), so skip formatting when filtered
+        main_app_logger.warning(
+            f"Request ID: {request_id} - FastAPIHTTPException: Status={exc.status_code}, Detail='{exc.detail}' for {request.method} {request.url.path}",
+            exc_info=False # Typically, HTTPException details are sufficient, no full stack trace needed unless debugging
+        )
+    return _error_response(
+        exc.status_code, exc.detail, f"HTTP_{exc.status_code}",
         headers=getattr(exc, "headers", None), # Preserve headers if any from original HTTPException
     )
 
@@ -144,10 +173,7 @@ async def ollama_client_response_error_handler(request: Request, exc: ollama.Res
     if exc.status_code == 404:
         detail_message = f"Ollama model not found or Ollama endpoint unavailable: {exc.error or 'Ensure model is pulled and Ollama server is correct.'}"
     
-    return JSONResponse(
-        status_code=status_code_to_return,
-        content=APIErrorResponse(error=APIErrorDetail(message=detail_message, error_code="OLLAMA_API_ERROR")).model_dump()
-    )
+    return _error_response(status_code_to_return, detail_message, "OLLAMA_API_ERROR")
 
 @app.exception_handler(ConnectionError) # Handles generic ConnectionErrors (e.g., OllamaService.get_client fails)
 async def python_connection_error_handler(request: Request, exc: ConnectionError):
@@ -156,10 +182,7 @@ async def python_connection_error_handler(request: Request, exc: ConnectionError
         f"Request ID: {request_id} - Python ConnectionError: Message='{str(exc)}' for {request.method} {request.url.path}",
         exc_info=True
     )
-    return JSONResponse(
-        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-        content=APIErrorResponse(error=APIErrorDetail(message=f"A required external service is unreachable: {str(exc)}", error_code="SERVICE_CONNECTION_ERROR")).model_dump()
-    )
+    return _error_response(status.HTTP_503_SERVICE_UNAVAILABLE, f"A required external service is unreachable: {str(exc)}", "SERVICE_CONNECTION_ERROR")
 
 @app.exception_handler(Exception) # Catch-all for any other unhandled Python exceptions
 async def unhandled_python_exception_handler(request: Request, exc: Exception):
@@ -168,9 +191,10 @@ async def unhandled_python_exception_handler(request: Request, exc: Exception):
         f"Request ID: {request_id} - Unhandled Python Exception: Type={type(exc).__name__}, Message='{str(exc)}' for {request.method} {request.url.path}",
         exc_info=True # Log the full stack trace for unhandled exceptions
     )
-    return JSONResponse(
+    return Response(
+        content=_UNHANDLED_ERROR_BODY_PREFIX + request_id.encode("ascii") + _UNHANDLED_ERROR_BODY_SUFFIX,
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=APIErrorResponse(error=APIErrorDetail(message=f"An unexpected internal server error occurred. Ref ID: {request_id}", error_code="UNHANDLED_SERVER_ERROR")).model_dump()
+        media_type="application/json"
     )
 
 
@@ -181,19 +205,47 @@ app.include_router(router_admin.router)
 main_app_logger.info("API routers included: Dialogue, Movement, Admin.")
 
 # --- Root Path Health Check Endpoint ---
+
+# Health polls within the TTL share one Ollama round trip; the lock keeps a burst of expired polls to a single probe.
+_OLLAMA_PROBE_TTL_SECONDS = 5.0
+_ollama_probe_cache = {"checked_at": float("-inf"), "status": "Unknown"}
+_ollama_probe_lock: Optional[asyncio.Lock] = None
+_ollama_probe_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_ollama_probe_lock() -> asyncio.Lock:
+    """Returns the probe lock for the running event loop, creating it on first use in that loop."""
+    global _ollama_probe_lock, _ollama_probe_lock_loop
+    running_loop = asyncio.get_running_loop()
+    if _ollama_probe_lock is None or _ollama_probe_lock_loop is not running_loop:
+        _ollama_probe_lock = asyncio.Lock()
+        _ollama_probe_lock_loop = running_loop
+    return _ollama_probe_lock
+
+async def _probe_ollama_connection() -> str:
+    if time.monotonic() - _ollama_probe_cache["checked_at"] < _OLLAMA_PROBE_TTL_SECONDS:
+        return _ollama_probe_cache["status"]
+    async with _get_ollama_probe_lock():
+        if time.monotonic() - _ollama_probe_cache["checked_at"] < _OLLAMA_PROBE_TTL_SECONDS: # Refreshed while we waited
+            return _ollama_probe_cache["status"]
+        try:
+            # A light check, like listing models (or just rely on is_ready flag)
+            await OllamaService.list_available_models(log_success=False) # Don't log full list here
+            ollama_conn_status = "Connected and Responsive"
+        except Exception:
+            ollama_conn_status = "Initialization Succeeded but Currently Unresponsive"
+        _ollama_probe_cache["status"] = ollama_conn_status
+        _ollama_probe_cache["checked_at"] = time.monotonic()
+        return ollama_conn_status
+
 @app.get("/", response_model=HealthStatusResponse, tags=["Health Check"])
 async def root_health_check():
     """
     Provides a basic health check of the API and its connection to Ollama.
+    The Ollama probe result is reused for a few seconds so frequent polling doesn't load Ollama.
     """
     ollama_conn_status = "Unknown"
     if OllamaService.is_ready(): # Check if client was successfully initialized
-        try:
-            # A light check, like listing models (or just rely on is_ready flag)
-            await OllamaService.list_available_models(log_success=False) # Don't log full list here
-            ollama_conn_status = "Connected and Responsive"
-        except Exception:
-            ollama_conn_status = "Initialization Succeeded but Currently Unresponsive"
+        ollama_conn_status = await _probe_ollama_connection()
     else:
         ollama_conn_status = "Disconnected or Initialization Failed"
 
@@ -7,7 +7,7 @@ from app.core.schemas import (
     ClearMemoryAdministrativelyResponse, # 從 schemas 導入
     NPCMemoryFile # For potentially viewing memory (example, not fully implemented here)
 )
-from app.services.npc_memory_service import NPCMemoryService # NPCMemoryService
+from app.services.npc_memory_service import NPCMemoryService, save_all_dirty_npc_memories # NPCMemoryService
 from app.core.logging_config import setup_logging # 日誌
 from app.core.config import settings_instance as settings # 獲取設定, e.g. NPC_MEMORY_DIR
 # For future admin auth:
@@ -146,7 +146,6 @@ async def trigger_save_all_memories_endpoint():
     This is normally handled on shutdown.
     """
     logger.info("ADMIN ACTION: Manual trigger for saving all dirty NPC memories.")
-    from app.services.npc_memory_service import save_all_dirty_npc_memories # Import here to avoid circular dependency at module level
     
     try:
         await save_all_dirty_npc_memories()
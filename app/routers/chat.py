@@ -2,13 +2,14 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, Body, Query
 from fastapi.responses import StreamingResponse # For streaming chat if implemented
-from typing import List, Dict, Any, AsyncGenerator # For streaming
+from typing import List, Dict, Any, AsyncGenerator, Optional # For streaming
 import time
 import ollama # For ollama.ResponseError
 
 from app.core.schemas import (
     StandardChatRequest, SimpleChatRequest, ChatResponse,
     GameInteractionRequest, GameInteractionResponse,
+    BatchTranslationRequest, BatchTranslationResponse,
     ListOllamaModelsResponse, OllamaModelInfo, # Ensure these are defined in schemas.py
     Message, MessageRole # For potential streaming construction
 )
@@ -26,15 +27,27 @@ router = APIRouter(
     tags=["Dialogue Engine & LLM Interaction"]
 )
 
-# --- Dependency Injection for DialogueService ---
+# --- Dependency Injection for TextTranslatorService / DialogueService ---
+_shared_translator_service: Optional[TextTranslatorService] = None
+
+async def get_translator_service(
+    ollama_s: OllamaService = Depends(get_ollama_service)
+) -> TextTranslatorService:
+    """
+    Dependency to get the shared TextTranslatorService (built on the shared OllamaService).
+    One instance serves every request so its translation cache carries across requests.
+    """
+    global _shared_translator_service
+    if _shared_translator_service is None or _shared_translator_service.ollama_service is not ollama_s:
+        _shared_translator_service = TextTranslatorService(ollama_service=ollama_s)
+    return _shared_translator_service
+
 async def get_dialogue_service(
     ollama_s: OllamaService = Depends(get_ollama_service),
-    # translator_s can also be a separate dependency if preferred
+    translator_s: TextTranslatorService = Depends(get_translator_service)
 ) -> DialogueService:
     """Dependency to get an instance of DialogueService."""
-    # TextTranslatorService is instantiated here, using the shared OllamaService
-    translator_instance = TextTranslatorService(ollama_service=ollama_s)
-    return DialogueService(ollama_s=ollama_s, translator_s=translator_instance)
+    return DialogueService(ollama_s=ollama_s, translator_s=translator_s)
 
 # --- API Endpoints ---
 
@@ -169,6 +182,38 @@ async def handle_game_interaction(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Failed to process game interaction: {type(e).__name__}")
 
 
+@router.post("/translate-batch", response_model=BatchTranslationResponse)
+async def handle_batch_translation(
+    request: BatchTranslationRequest,
+    translator_s: TextTranslatorService = Depends(get_translator_service)
+):
+    """
+    Translates a list of texts in one request (e.g. UI strings or queued dialogue lines).
+    Short lines are batched into shared LLM calls and requests run concurrently; failed items come back
+    as bracketed error placeholders, like the translations in /game-interaction.
+    """
+    request_start_time = time.perf_counter()
+    logger.info(f"Batch translation request for {len(request.texts)} texts to '{request.target_language}'.")
+
+    try:
+        translations = await translator_s.translate_texts(
+            request.texts,
+            target_language=request.target_language,
+            source_language=request.source_language,
+            translation_model_override=request.model
+        )
+        total_api_processing_time_ms = (time.perf_counter() - request_start_time) * 1000
+        logger.info(f"Batch translation of {len(request.texts)} texts processed in {total_api_processing_time_ms:.0f}ms total API time.")
+
+        return BatchTranslationResponse(
+            translations=translations,
+            total_api_processing_time_ms=round(total_api_processing_time_ms, 2)
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error in /translate-batch: {e}", exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Failed to process batch translation: {type(e).__name__}")
+
+
 @router.get("/list-models", response_model=ListOllamaModelsResponse)
 async def list_available_ollama_models(
     ollama_s: OllamaService = Depends(get_ollama_service)
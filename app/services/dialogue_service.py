@@ -12,6 +12,7 @@ from app.llm.translators import TextTranslatorService # 我們之前設計的翻
 from app.core.config import settings_instance as settings
 from app.core.logging_config import setup_logging
 import uuid
+import asyncio
 from datetime import datetime, timezone
 import time
 import ollama # For ollama.ResponseError
@@ -36,7 +37,7 @@ class DialogueService:
         self.ollama_service = ollama_s
         self.translator_service = translator_s
 
-    async def _generate_and_translate_turn(
+    async def _generate_turn(
         self,
         npc_info: InteractingObjectInfo,
         effective_model: str,
@@ -44,7 +45,8 @@ class DialogueService:
         ollama_options: Optional[OllamaChatOptions] = None
     ) -> DialogueTurn:
         """
-        Helper to generate a single turn's response from LLM and translate it.
+        Helper to generate a single turn's response from LLM.
+        The translation is left unset; generate_interactive_dialogue translates turns concurrently with later turns.
         """
         turn_timestamp = default_aware_utcnow()
         llm_response_data: Optional[Dict[str, Any]] = None
@@ -87,17 +89,12 @@ class DialogueService:
             logger.error(f"Unexpected error generating turn for NPC '{npc_info.npc_id}': {e}", exc_info=True)
             generated_message_original_content = f"[LLM Error: Unexpected {type(e).__name__}]"
 
-        # Translate the original message
-        translated_message_zh_tw = await self.translator_service.translate_text(
-            text_to_translate=generated_message_original_content,
-            # source_language, target_language, translation_model_override can be added if needed
-        )
 
         return DialogueTurn(
             npc_id=npc_info.npc_id,
             name=npc_info.name,
             message_original_language=generated_message_original_content,
-            message_translated_zh_tw=translated_message_zh_tw,
+            message_translated_zh_tw=None, # Filled in by generate_interactive_dialogue once the translation finishes
             model_used=model_actually_used,
             timestamp_api_generated=turn_timestamp, # When this DialogueTurn object was created by API
             # llm_generated_emotional_tone=llm_generated_emotional_tone # Add if implemented
@@ -128,105 +125,131 @@ class DialogueService:
              llm_context_messages.append(Message(role=MessageRole.SYSTEM, content=f"Current game time: {request.game_time_context.time_of_day} ({time_str})."))
 
 
-        for turn_num in range(request.max_turns_per_object):
-            for current_object_config in request.interacting_objects:
-                turn_processing_start_time = time.perf_counter()
+        # Interacting_with_entities should be all *other* objects in this interaction.
+        # The participants don't change between turns, so each object's identifier and partner list is built once here
+        # instead of re-scanning interacting_objects on every turn.
+        prompt_identities = [
+            (
+                NPCIdentifier(npc_id=obj.npc_id, name=obj.name),
+                [NPCIdentifier(npc_id=other.npc_id, name=other.name) for other in request.interacting_objects if other.npc_id != obj.npc_id]
+            )
+            for obj in request.interacting_objects
+        ]
+
+        # The next turn only needs the original-language text, so each turn's translation runs as a background task
+        # while later turns are being generated; they are all awaited once at the end.
+        translation_tasks: List[asyncio.Task] = []
+
+        try:
+            for turn_num in range(request.max_turns_per_object):
+                for current_object_config, (current_identifier, other_objects_for_prompt) in zip(request.interacting_objects, prompt_identities):
+                    turn_processing_start_time = time.perf_counter()
                 
-                # Prepare system prompt for the current object
-                # Interacting_with_entities should be all *other* objects in this interaction
-                other_objects_for_prompt = [
-                    NPCIdentifier(npc_id=obj.npc_id, name=obj.name)
-                    for obj in request.interacting_objects if obj.npc_id != current_object_config.npc_id
-                ]
-                system_prompt_content = build_dialogue_system_prompt(
-                    npc_info=NPCIdentifier(npc_id=current_object_config.npc_id, name=current_object_config.name),
-                    interacting_with_entities=other_objects_for_prompt,
-                    # scene_context_description is part of llm_context_messages now
-                    dialogue_mode_tag=current_object_config.dialogue_mode_tag,
-                    npc_emotional_state_input=current_object_config.emotional_state_input,
-                    additional_dialogue_goal=None # Can be parameterized if needed
-                )
+                    # Prepare system prompt for the current object
+                    system_prompt_content = build_dialogue_system_prompt(
+                        npc_info=current_identifier,
+                        interacting_with_entities=other_objects_for_prompt,
+                        # scene_context_description is part of llm_context_messages now
+                        dialogue_mode_tag=current_object_config.dialogue_mode_tag,
+                        npc_emotional_state_input=current_object_config.emotional_state_input,
+                        additional_dialogue_goal=None # Can be parameterized if needed
+                    )
                 
-                # Messages for this specific LLM call: system prompt + current history + user prompt for this turn
-                messages_for_this_llm_call: List[Message] = [Message(role=MessageRole.SYSTEM, content=system_prompt_content)]
-                messages_for_this_llm_call.extend(llm_context_messages) # Add the accumulated history
-
-                # Determine the "user" prompt for the LLM for this object's turn
-                # This could be the object's initial_prompt_to_llm, or a generic "What do you do/say?"
-                user_prompt_for_this_turn = current_object_config.initial_prompt_to_llm
-                if not user_prompt_for_this_turn:
-                    if not llm_context_messages: # If it's the very first utterance in the interaction
-                        user_prompt_for_this_turn = f"You are '{current_object_config.name or current_object_config.npc_id}'. The interaction begins. What do you say or do?"
-                    else:
-                        last_speaker_msg = llm_context_messages[-1] if llm_context_messages else None
-                        if last_speaker_msg and last_speaker_msg.role == MessageRole.ASSISTANT : # Responding to another assistant
-                             last_speaker_name = last_speaker_msg.name or "The previous character"
-                             user_prompt_for_this_turn = f"{last_speaker_name} just spoke. Now it's your turn, '{current_object_config.name or current_object_config.npc_id}'. What is your response or action?"
-                        else: # Generic prompt if last was system or user (player)
-                             user_prompt_for_this_turn = f"It's your turn, '{current_object_config.name or current_object_config.npc_id}'. What do you say or do?"
-
-                messages_for_this_llm_call.append(Message(role=MessageRole.USER, content=user_prompt_for_this_turn))
-
-                effective_model = current_object_config.model_override or settings.DEFAULT_OLLAMA_MODEL
+                    # Messages for this specific LLM call: system prompt + current history + user prompt for this turn
+                    messages_for_this_llm_call: List[Message] = [Message(role=MessageRole.SYSTEM, content=system_prompt_content)]
+                    messages_for_this_llm_call.extend(llm_context_messages) # Add the accumulated history
+
+                    # Determine the "user" prompt for the LLM for this object's turn
+                    # This could be the object's initial_prompt_to_llm, or a generic "What do you do/say?"
+                    user_prompt_for_this_turn = current_object_config.initial_prompt_to_llm
+                    if not user_prompt_for_this_turn:
+                        if not llm_context_messages: # If it's the very first utterance in the interaction
+                            user_prompt_for_this_turn = f"You are '{current_object_config.name or current_object_config.npc_id}'. The interaction begins. What do you say or do?"
+                        else:
+                            last_speaker_msg = llm_context_messages[-1] if llm_context_messages else None
+                            if last_speaker_msg and last_speaker_msg.role == MessageRole.ASSISTANT : # Responding to another assistant
+                                 last_speaker_name = last_speaker_msg.name or "The previous character"
+                                 user_prompt_for_this_turn = f"{last_speaker_name} just spoke. Now it's your turn, '{current_object_config.name or current_object_config.npc_id}'. What is your response or action?"
+                            else: # Generic prompt if last was system or user (player)
+                                 user_prompt_for_this_turn = f"It's your turn, '{current_object_config.name or current_object_config.npc_id}'. What do you say or do?"
+
+                    messages_for_this_llm_call.append(Message(role=MessageRole.USER, content=user_prompt_for_this_turn))
+
+                    effective_model = current_object_config.model_override or settings.DEFAULT_OLLAMA_MODEL
                 
-                # Assuming current_object_config might have its own OllamaChatOptions
-                # If not, ollama_options can be None or a default can be created here.
-                # For simplicity, let's assume no per-object options override for now.
-                chat_opts_for_turn: Optional[OllamaChatOptions] = None 
-                # Example if you add OllamaChatOptions to InteractingObjectInfo:
-                # if hasattr(current_object_config, 'ollama_options') and current_object_config.ollama_options:
-                #    chat_opts_for_turn = current_object_config.ollama_options
-
-                # Generate and translate the turn
-                generated_turn: DialogueTurn = await self._generate_and_translate_turn(
-                    npc_info=current_object_config, # Pass the full InteractingObjectInfo
-                    effective_model=effective_model,
-                    messages_for_llm=messages_for_this_llm_call,
-                    ollama_options=chat_opts_for_turn 
-                )
+                    # Assuming current_object_config might have its own OllamaChatOptions
+                    # If not, ollama_options can be None or a default can be created here.
+                    # For simplicity, let's assume no per-object options override for now.
+                    chat_opts_for_turn: Optional[OllamaChatOptions] = None 
+                    # Example if you add OllamaChatOptions to InteractingObjectInfo:
+                    # if hasattr(current_object_config, 'ollama_options') and current_object_config.ollama_options:
+                    #    chat_opts_for_turn = current_object_config.ollama_options
+
+                    # Generate the turn, then start its translation without waiting for it
+                    generated_turn: DialogueTurn = await self._generate_turn(
+                        npc_info=current_object_config, # Pass the full InteractingObjectInfo
+                        effective_model=effective_model,
+                        messages_for_llm=messages_for_this_llm_call,
+                        ollama_options=chat_opts_for_turn 
+                    )
                 
-                turn_processing_time_ms = (time.perf_counter() - turn_processing_start_time) * 1000
-                generated_turn.turn_processing_time_ms = round(turn_processing_time_ms, 2)
-                dialogue_turns_history.append(generated_turn)
-
-                # Add this turn's actual outcome to the LLM context for the *next* turn/object
-                # Important: Use the *original language* message for the LLM context.
-                # We represent the "user" prompt that led to this turn, and then the "assistant" (this NPC's) response.
-                # This helps the next LLM understand what this NPC was responding to.
+                    turn_processing_time_ms = (time.perf_counter() - turn_processing_start_time) * 1000
+                    generated_turn.turn_processing_time_ms = round(turn_processing_time_ms, 2)
+                    dialogue_turns_history.append(generated_turn)
+                    translation_tasks.append(asyncio.create_task(self.translator_service.translate_text(
+                        text_to_translate=generated_turn.message_original_language,
+                        # source_language, target_language, translation_model_override can be added if needed
+                    )))
+
+                    # Add this turn's actual outcome to the LLM context for the *next* turn/object
+                    # Important: Use the *original language* message for the LLM context.
+                    # We represent the "user" prompt that led to this turn, and then the "assistant" (this NPC's) response.
+                    # This helps the next LLM understand what this NPC was responding to.
                 
-                # *** MODIFICATION FOR FIX 4 START ***
-                if not generated_turn.message_original_language.startswith("[LLM Error:") and \
-                   not generated_turn.message_original_language.startswith("[Translation"):
-                # *** MODIFICATION FOR FIX 4 END ***
-                    llm_context_messages.append(Message(
-                        role=MessageRole.USER, # Or System, to indicate what the NPC was prompted with
-                        content=f"({current_object_config.name or current_object_config.npc_id} was prompted with: '{user_prompt_for_this_turn}')"
-                    ))
-                    llm_context_messages.append(Message(
-                        role=MessageRole.ASSISTANT,
-                        content=generated_turn.message_original_language,
-                        name=current_object_config.name or current_object_config.npc_id # Name the assistant for multi-agent
-                    ))
-                else: # If there was an error, add a placeholder to history to maintain turn structure
-                    llm_context_messages.append(Message(role=MessageRole.SYSTEM, content=f"({current_object_config.name or current_object_config.npc_id} encountered an error and could not respond meaningfully.)"))
-
-
-                # Context window management: If llm_context_messages gets too long, truncate older messages
-                # This is a simple truncation, more sophisticated summarization could be used.
-                # A good num_ctx for LLM might be settings.DEFAULT_MAX_TOKENS.
-                # We need to estimate token count or message count. For simplicity, let's use message count.
-                # Keep, e.g., last 20 messages (10 turns of user/assistant) + initial system messages.
-                MAX_CONTEXT_MESSAGES = 30 # Example
-                if len(llm_context_messages) > MAX_CONTEXT_MESSAGES:
-                    initial_system_count = 0
-                    if request.scene_context_description: initial_system_count +=1
-                    if request.game_time_context: initial_system_count+=1
+                    # *** MODIFICATION FOR FIX 4 START ***
+                    if not generated_turn.message_original_language.startswith("[LLM Error:") and \
+                       not generated_turn.message_original_language.startswith("[Translation"):
+                    # *** MODIFICATION FOR FIX 4 END ***
+                        llm_context_messages.append(Message(
+                            role=MessageRole.USER, # Or System, to indicate what the NPC was prompted with
+                            content=f"({current_object_config.name or current_object_config.npc_id} was prompted with: '{user_prompt_for_this_turn}')"
+                        ))
+                        llm_context_messages.append(Message(
+                            role=MessageRole.ASSISTANT,
+                            content=generated_turn.message_original_language,
+                            name=current_object_config.name or current_object_config.npc_id # Name the assistant for multi-agent
+                        ))
+                    else: # If there was an error, add a placeholder to history to maintain turn structure
+                        llm_context_messages.append(Message(role=MessageRole.SYSTEM, content=f"({current_object_config.name or current_object_config.npc_id} encountered an error and could not respond meaningfully.)"))
+
+
+                    # Context window management: If llm_context_messages gets too long, truncate older messages
+                    # This is a simple truncation, more sophisticated summarization could be used.
+                    # A good num_ctx for LLM might be settings.DEFAULT_MAX_TOKENS.
+                    # We need to estimate token count or message count. For simplicity, let's use message count.
+                    # Keep, e.g., last 20 messages (10 turns of user/assistant) + initial system messages.
+                    MAX_CONTEXT_MESSAGES = 30 # Example
+                    if len(llm_context_messages) > MAX_CONTEXT_MESSAGES:
+                        initial_system_count = 0
+                        if request.scene_context_description: initial_system_count +=1
+                        if request.game_time_context: initial_system_count+=1
                     
-                    messages_to_keep = llm_context_messages[:initial_system_count] + \
-                                       llm_context_messages[-(MAX_CONTEXT_MESSAGES - initial_system_count):]
-                    llm_context_messages = messages_to_keep
-                    logger.debug(f"LLM context history truncated to {len(llm_context_messages)} messages for session '{interaction_session_id}'.")
-
+                        messages_to_keep = llm_context_messages[:initial_system_count] + \
+                                           llm_context_messages[-(MAX_CONTEXT_MESSAGES - initial_system_count):]
+                        llm_context_messages = messages_to_keep
+                        logger.debug(f"LLM context history truncated to {len(llm_context_messages)} messages for session '{interaction_session_id}'.")
+
+            # translate_text handles its own errors, so gather only ever returns strings (or None for empty input).
+            for generated_turn, translated_message_zh_tw in zip(dialogue_turns_history, await asyncio.gather(*translation_tasks)):
+                generated_turn.message_translated_zh_tw = translated_message_zh_tw
+        finally:
+            # If a turn raised or the request was cancelled before the gather above, don't leave translations
+            # running (and calling Ollama) for a response nobody will receive.
+            cancelled_tasks = [translation_task for translation_task in translation_tasks if not translation_task.done()]
+            for translation_task in cancelled_tasks:
+                translation_task.cancel()
+            if cancelled_tasks: # Let the cancellations finish so no task is destroyed while still pending
+                await asyncio.gather(*cancelled_tasks, return_exceptions=True)
 
         return interaction_session_id, dialogue_turns_history
 
@@ -1,11 +1,13 @@
 # npc_api_suite/app/services/movement_service.py
 
+import logging
 import math
 import random
 import re 
 import time 
 from typing import Tuple, Optional, List, Dict, Any, Union 
 from datetime import datetime, timezone 
+from enum import IntFlag
 import yaml 
 
 from app.core.schemas import (
@@ -23,6 +25,33 @@ from app.utils.helpers import parse_coordinates_from_text, clamp_position_to_bou
 
 logger = setup_logging(__name__)
 
+class LandmarkStatusFlags(IntFlag):
+    """Landmark status notes reduced to bits, relative to the NPC doing the looking."""
+    NONE = 0
+    OCCUPIED_BY_OTHER = 1
+    OCCUPIED_BY_SELF = 2
+    OWNER_ABSENT = 4
+    OWNER_PRESENT = 8
+
+def _classify_status_notes(status_notes: List[str], npc_id_lower: str) -> LandmarkStatusFlags:
+    """Scans the raw status notes once and returns their flags (npc_id_lower must already be lower-cased)."""
+    flags = LandmarkStatusFlags.NONE
+    for note in status_notes:
+        note_lower = note.lower()
+        # Families are checked independently: one note can carry several tags, and every one of them must count.
+        if "occupancy_occupied" in note_lower:
+            flags |= LandmarkStatusFlags.OCCUPIED_BY_OTHER if npc_id_lower not in note_lower else LandmarkStatusFlags.OCCUPIED_BY_SELF
+        if "owner_presence_absent" in note_lower:
+            flags |= LandmarkStatusFlags.OWNER_ABSENT
+        if "owner_presence_present" in note_lower:
+            flags |= LandmarkStatusFlags.OWNER_PRESENT
+    return flags
+
+# Fixed vocabularies checked per landmark / per decision; frozensets make membership a hash lookup.
+_COMMON_AREA_LANDMARK_TYPES = frozenset({"living_room", "kitchen", "dining_room"})
+_NO_EMOTION_CHANGE_TAGS = frozenset({"no_change", "same", "n/a", "none", "neutral"})
+_EMOTION_WORDS_IN_COMMENTARY = ("happy", "sad", "angry", "curious", "content", "annoyed", "fearful") # Checked in order
+
 class MovementService:
     def __init__(self, ollama_s: OllamaService):
         self.ollama_service = ollama_s
@@ -48,13 +77,16 @@ class MovementService:
         ]
 
         cleaned_text = text
+        cleaned_text_lower = cleaned_text.lower() # Re-lowered only when the text is actually trimmed
         for prefix in prefixes_to_remove:
-            if cleaned_text.lower().startswith(prefix.lower()):
+            if cleaned_text_lower.startswith(prefix.lower()):
                 cleaned_text = cleaned_text[len(prefix):].lstrip()
+                cleaned_text_lower = cleaned_text.lower()
         
         for suffix in suffixes_to_remove:
-            if cleaned_text.lower().endswith(suffix.lower()):
+            if cleaned_text_lower.endswith(suffix.lower()):
                 cleaned_text = cleaned_text[:-len(suffix)].rstrip()
+                cleaned_text_lower = cleaned_text.lower()
         
         lines = cleaned_text.splitlines()
         # processed_lines = [] # This variable was unused
@@ -118,7 +150,8 @@ class MovementService:
                 parsed_data["chosen_action"] = data.get("chosen_action", parsed_data["chosen_action"])
                 parsed_data["target_coordinates"] = data.get("target_coordinates") 
                 parsed_data["resulting_emotion_tag"] = data.get("resulting_emotion_tag", parsed_data["resulting_emotion_tag"])
-                logger.debug(f"Successfully parsed LLM YAML output: {parsed_data}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Successfully parsed LLM YAML output: {parsed_data}")
                 return parsed_data
             else:
                 logger.warning(f"LLM output (after cleaning: '{cleaned_response_for_yaml[:200]}...') was not a valid YAML dictionary. Will attempt regex.")
@@ -156,7 +189,8 @@ class MovementService:
         emotion_match = re.search(r"resulting_emotion_tag:\s*\"?(.*?)\"?\s*$", original_llm_text_for_regex, re.DOTALL | re.IGNORECASE)
         if emotion_match: parsed_data["resulting_emotion_tag"] = emotion_match.group(1).strip().strip('"')
         
-        logger.debug(f"Parsed LLM output using regex fallback: {parsed_data}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Parsed LLM output using regex fallback: {parsed_data}")
         
         return parsed_data
 
@@ -172,14 +206,22 @@ class MovementService:
     ) -> Tuple[float, float]:
         logger.info(f"NPC '{npc_id_str}': Executing FALLBACK exploration strategy for apartment from ({current_pos.x:.1f}, {current_pos.y:.1f}).")
         potential_targets: List[Dict[str, Any]] = []
+        npc_id_lower = npc_id_str.lower()
+        # Settings read once per call; they are used inside every loop below.
+        min_search_distance = settings.MIN_SEARCH_DISTANCE_FOR_NEW_POINT
+        max_search_distance = settings.MAX_SEARCH_DISTANCE_FOR_NEW_POINT
+        boundary_buffer = settings.SCENE_BOUNDARY_BUFFER
+        cur_x, cur_y = current_pos.x, current_pos.y
 
         for lm in landmarks:
+            owner_id_lower = lm.owner_id.lower() if lm.owner_id else None
+            status_flags = _classify_status_notes(lm.current_status_notes, npc_id_lower)
             is_accessible = True
             if lm.landmark_type_tag == "bathroom":
-                if any("occupancy_occupied" in note.lower() and npc_id_str.lower() not in note.lower() for note in lm.current_status_notes):
+                if status_flags & LandmarkStatusFlags.OCCUPIED_BY_OTHER:
                     is_accessible = False
-            elif lm.landmark_type_tag == "bedroom" and lm.owner_id and lm.owner_id.lower() != npc_id_str.lower():
-                if any("owner_presence_absent" in note.lower() for note in lm.current_status_notes):
+            elif lm.landmark_type_tag == "bedroom" and owner_id_lower and owner_id_lower != npc_id_lower:
+                if status_flags & LandmarkStatusFlags.OWNER_ABSENT:
                     is_accessible = False
             
             if not is_accessible:
@@ -187,11 +229,11 @@ class MovementService:
                 continue
 
             dist_to_lm = current_pos.distance_to(lm.position)
-            if settings.MIN_SEARCH_DISTANCE_FOR_NEW_POINT * 0.5 <= dist_to_lm <= settings.MAX_SEARCH_DISTANCE_FOR_NEW_POINT * 0.7:
+            if min_search_distance * 0.5 <= dist_to_lm <= max_search_distance * 0.7:
                 score = 50 
-                if lm.landmark_type_tag in ["living_room", "kitchen", "dining_room"]:
+                if lm.landmark_type_tag in _COMMON_AREA_LANDMARK_TYPES:
                     score += 20
-                elif lm.landmark_type_tag == "bedroom" and lm.owner_id and lm.owner_id.lower() == npc_id_str.lower():
+                elif lm.landmark_type_tag == "bedroom" and owner_id_lower and owner_id_lower == npc_id_lower:
                     score += 15
                 potential_targets.append({"x": lm.position.x, "y": lm.position.y, "type": f"landmark:{lm.landmark_name}", "base_score": score})
         
@@ -199,25 +241,28 @@ class MovementService:
         for i in range(num_random_points):
             angle = random.uniform(0, 2 * math.pi)
             distance = random.uniform(
-                settings.MIN_SEARCH_DISTANCE_FOR_NEW_POINT * 0.7, 
-                settings.MAX_SEARCH_DISTANCE_FOR_NEW_POINT * 0.5 
+                min_search_distance * 0.7, 
+                max_search_distance * 0.5 
             )
-            x_rand = current_pos.x + distance * math.cos(angle)
-            y_rand = current_pos.y + distance * math.sin(angle)
+            x_rand = cur_x + distance * math.cos(angle)
+            y_rand = cur_y + distance * math.sin(angle)
             potential_targets.append({"x": x_rand, "y": y_rand, "type": f"random_explore_{i}", "base_score": 30})
         
         scored_targets: List[Dict[str, Any]] = []
         if not potential_targets:
             logger.warning(f"NPC '{npc_id_str}': No potential fallback targets generated. Using emergency random within bounds.")
-            x_emergency = random.uniform(bounds.min_x + settings.SCENE_BOUNDARY_BUFFER, bounds.max_x - settings.SCENE_BOUNDARY_BUFFER)
-            y_emergency = random.uniform(bounds.min_y + settings.SCENE_BOUNDARY_BUFFER, bounds.max_y - settings.SCENE_BOUNDARY_BUFFER)
+            x_emergency = random.uniform(bounds.min_x + boundary_buffer, bounds.max_x - boundary_buffer)
+            y_emergency = random.uniform(bounds.min_y + boundary_buffer, bounds.max_y - boundary_buffer)
             return x_emergency, y_emergency
 
+        # Entity positions are compared against every candidate point; read them off the models once.
+        other_entity_coords = [(entity_info.x, entity_info.y) for entity_info in other_entities] if other_entities else []
+
         for pt in potential_targets:
-            x_clamped, y_clamped = clamp_position_to_bounds(pt["x"], pt["y"], bounds, settings.SCENE_BOUNDARY_BUFFER)
+            x_clamped, y_clamped = clamp_position_to_bounds(pt["x"], pt["y"], bounds, boundary_buffer)
             
-            dist_from_current = current_pos.distance_to(Position(x=x_clamped, y=y_clamped))
-            if dist_from_current < settings.MIN_SEARCH_DISTANCE_FOR_NEW_POINT * 0.3:
+            dist_from_current = math.hypot(x_clamped - cur_x, y_clamped - cur_y)
+            if dist_from_current < min_search_distance * 0.3:
                 continue
             
             score = float(pt["base_score"])
@@ -229,23 +274,22 @@ class MovementService:
             else:
                 logger.warning(f"Fallback exploration for {npc_id_str}: current_game_time or timestamp invalid, skipping revisit check.")
             
-            if other_entities:
-                for entity_info in other_entities:
-                    if Position(x=x_clamped,y=y_clamped).distance_to(Position(x=entity_info.x,y=entity_info.y)) < 2.0: 
-                        score -= 25
+            for entity_x, entity_y in other_entity_coords:
+                if math.hypot(x_clamped - entity_x, y_clamped - entity_y) < 2.0: 
+                    score -= 25
 
             score += random.uniform(-15, 15) 
 
             scored_targets.append({"x": x_clamped, "y": y_clamped, "type": pt["type"], "score": score, "dist": dist_from_current})
         
         if scored_targets:
-            best_target = sorted(scored_targets, key=lambda t: t["score"], reverse=True)[0]
+            best_target = max(scored_targets, key=lambda t: t["score"])
             logger.info(f"NPC '{npc_id_str}': Fallback strategy selected target: Type='{best_target['type']}', Coords=({best_target['x']:.1f}, {best_target['y']:.1f}), Score={best_target['score']:.1f}")
             return best_target["x"], best_target["y"]
         else:
             logger.warning(f"NPC '{npc_id_str}': All scored fallback targets were filtered. Using emergency random point.")
-            x_emergency = random.uniform(bounds.min_x + settings.SCENE_BOUNDARY_BUFFER, bounds.max_x - settings.SCENE_BOUNDARY_BUFFER)
-            y_emergency = random.uniform(bounds.min_y + settings.SCENE_BOUNDARY_BUFFER, bounds.max_y - settings.SCENE_BOUNDARY_BUFFER)
+            x_emergency = random.uniform(bounds.min_x + boundary_buffer, bounds.max_x - boundary_buffer)
+            y_emergency = random.uniform(bounds.min_y + boundary_buffer, bounds.max_y - boundary_buffer)
             return x_emergency, y_emergency
 
     def _get_landmark_by_name_or_pos(
@@ -262,14 +306,16 @@ class MovementService:
                    (lm.landmark_type_tag and lm.landmark_type_tag.lower() in target_name_lower): 
                     return lm
         
-        if isinstance(target_name_or_pos, Position):
-            sorted_landmarks = sorted(
-                visible_landmarks,
-                key=lambda lm_i: lm_i.position.distance_to(target_name_or_pos)
+        if isinstance(target_name_or_pos, Position) and visible_landmarks:
+            # Only the nearest landmark matters: one distance per landmark, no full sort, no second distance_to.
+            target_x, target_y = target_name_or_pos.x, target_name_or_pos.y
+            nearest_dist, nearest_landmark = min(
+                ((math.hypot(lm_i.position.x - target_x, lm_i.position.y - target_y), lm_i) for lm_i in visible_landmarks),
+                key=lambda scored: scored[0]
             )
-            if sorted_landmarks and sorted_landmarks[0].position.distance_to(target_name_or_pos) < proximity_threshold:
-                logger.debug(f"LLM target coords ({target_name_or_pos.x:.1f}, {target_name_or_pos.y:.1f}) matched to landmark '{sorted_landmarks[0].landmark_name}' by proximity.")
-                return sorted_landmarks[0]
+            if nearest_dist < proximity_threshold:
+                logger.debug(f"LLM target coords ({target_x:.1f}, {target_y:.1f}) matched to landmark '{nearest_landmark.landmark_name}' by proximity.")
+                return nearest_landmark
         
         logger.debug(f"Could not reliably match target '{str(target_name_or_pos)}' to a specific visible landmark via name or proximity to LLM coords.")
         return None
@@ -303,7 +349,7 @@ class MovementService:
         npc_memory.last_known_position = request_data.current_npc_position
         npc_memory.last_known_game_time = request_data.current_game_time
 
-        system_prompt_for_llm = build_npc_movement_decision_prompt(
+        movement_prompt_messages: List[Message] = build_npc_movement_decision_prompt(
             npc_info=npc_id_obj,
             personality_description=npc_memory.personality_description,
             current_position=request_data.current_npc_position,
@@ -336,10 +382,9 @@ class MovementService:
                 top_p=0.92
             )
 
-            messages_for_llm = [Message(role=MessageRole.SYSTEM, content=system_prompt_for_llm)]
             ollama_response_data = await self.ollama_service.generate_chat_completion(
                 model=effective_model,
-                messages=messages_for_llm,
+                messages=movement_prompt_messages,
                 stream=False,
                 options=llm_options
             )
@@ -354,7 +399,8 @@ class MovementService:
                 logger.error(f"Unexpected response structure from ollama_service for NPC '{npc_id_obj.npc_id}': {str(ollama_response_data)[:300]}")
                 llm_response_raw = "[LLM Response Structure Invalid]"
 
-            logger.debug(f"NPC '{npc_id_obj.npc_id}' LLM Raw Response for movement (to be parsed): '{llm_response_raw[:300]}...'")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"NPC '{npc_id_obj.npc_id}' LLM Raw Response for movement (to be parsed): '{llm_response_raw[:300]}...'")
 
             parsed_llm_output = self._parse_structured_llm_movement_output(llm_response_raw)
             coords_str = parsed_llm_output.get("target_coordinates")
@@ -379,7 +425,8 @@ class MovementService:
             
             if not final_targeted_landmark and llm_action_summary_for_landmark_search:
                 search_term_from_action = ""
-                if "bathroom" in llm_action_summary_for_landmark_search.lower() or "toilet" in llm_action_summary_for_landmark_search.lower():
+                action_summary_lower = llm_action_summary_for_landmark_search.lower()
+                if "bathroom" in action_summary_lower or "toilet" in action_summary_lower:
                     search_term_from_action = "bathroom" 
                 
                 if search_term_from_action:
@@ -389,7 +436,7 @@ class MovementService:
 
             if final_targeted_landmark and \
                final_targeted_landmark.landmark_type_tag == "bathroom" and \
-               any("occupancy_occupied" in note.lower() and request_data.npc_id.lower() not in note.lower() for note in final_targeted_landmark.current_status_notes):
+               _classify_status_notes(final_targeted_landmark.current_status_notes, request_data.npc_id.lower()) & LandmarkStatusFlags.OCCUPIED_BY_OTHER:
                 
                 logger.info(f"NPC '{request_data.npc_id}' intends to go to bathroom '{final_targeted_landmark.landmark_name}', but it's occupied by another.")
                 
@@ -457,16 +504,15 @@ class MovementService:
         
         current_primary_emotion_lower = npc_memory.current_emotional_state.primary_emotion.lower()
         new_emotion_tag_lower = new_emotion_tag.lower() if isinstance(new_emotion_tag, str) else "no_change" 
-        meaningful_change_tags = ["no_change", "same", "n/a", "none", "neutral"]
         
         if isinstance(new_emotion_tag, str):
             cleaned_new_emotion_tag = re.sub(r"[\[\]\"']", "", new_emotion_tag).strip()
-            if "no change" in cleaned_new_emotion_tag.lower() or "neutral emotion" in cleaned_new_emotion_tag.lower() : 
-                 potential_emotions = ["happy", "sad", "angry", "curious", "content", "annoyed", "fearful"] 
+            cleaned_tag_lower = cleaned_new_emotion_tag.lower()
+            if "no change" in cleaned_tag_lower or "neutral emotion" in cleaned_tag_lower : 
                  found_emotion = "no_change" # Default to no_change if only commentary is found
                  # Try to find a primary emotion word if it's mixed with commentary
-                 for pe in potential_emotions:
-                     if pe in cleaned_new_emotion_tag.lower():
+                 for pe in _EMOTION_WORDS_IN_COMMENTARY:
+                     if pe in cleaned_tag_lower:
                          found_emotion = pe
                          break
                  cleaned_new_emotion_tag = found_emotion
@@ -474,7 +520,7 @@ class MovementService:
             new_emotion_tag_lower = cleaned_new_emotion_tag.lower()
 
             if cleaned_new_emotion_tag and \
-               new_emotion_tag_lower not in meaningful_change_tags and \
+               new_emotion_tag_lower not in _NO_EMOTION_CHANGE_TAGS and \
                new_emotion_tag_lower != current_primary_emotion_lower:
                 await memory_service.update_emotional_state(
                     new_primary_emotion=cleaned_new_emotion_tag, 
@@ -491,7 +537,7 @@ class MovementService:
 
         await memory_service.save_memory_to_file()
 
-        self._log_movement_decision_details(request_data, system_prompt_for_llm, llm_response_raw, final_target_position, decision_context_summary, parsed_llm_output)
+        self._log_movement_decision_details(request_data, movement_prompt_messages[-1].content, llm_response_raw, final_target_position, decision_context_summary, parsed_llm_output)
 
         api_processing_time_ms = (time.perf_counter() - request_start_time) * 1000
         
@@ -516,6 +562,9 @@ class MovementService:
         self, request: NPCMovementRequest, prompt: str, llm_response_raw_param: str, 
         final_target: Position, reason_summary: str, parsed_llm_output: Dict[str,Any]
     ):
+        # The trace is debug-only; don't dump the request models when nobody will see it.
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         log_entry = {
             "timestamp": default_aware_utcnow().isoformat(),
             "npc_id": request.npc_id,
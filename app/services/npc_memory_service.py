@@ -2,6 +2,7 @@
 
 import json
 import asyncio # For asyncio.Lock
+import heapq
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 import math # For distance calculations
@@ -27,6 +28,9 @@ def _get_npc_file_lock(npc_id: str) -> asyncio.Lock:
 
 _INSTANTIATED_MEMORY_SERVICES: Dict[str, 'NPCMemoryService'] = {}
 
+# Upper bound on memory files being written at once by save_all_dirty_npc_memories.
+MAX_CONCURRENT_MEMORY_SAVES = 16
+
 class NPCMemoryService:
     """
     Manages loading, updating, and saving an individual NPC's memory data.
@@ -166,37 +170,32 @@ class NPCMemoryService:
     # MODIFIED: Parameter 'current_game_time_dt: datetime' explicitly expects the datetime object from GameTime
     async def has_been_visited_recently(self, x: float, y: float, current_game_time_dt: datetime) -> bool:
         memory = await self.get_memory_data()
+        visit_threshold_distance = settings.VISIT_THRESHOLD_DISTANCE
+        revisit_interval_seconds = settings.REVISIT_INTERVAL_SECONDS
+
+        # Normalize the reference time once, outside the loop. Naive datetimes are treated as UTC on either side, so
+        # mixed naive/aware pairs stay comparable (Unity ISO strings and default_aware_utcnow normally give aware values).
+        current_game_time_naive = current_game_time_dt.tzinfo is None
+        current_game_time_dt_aware = current_game_time_dt.replace(tzinfo=timezone.utc) if current_game_time_naive else current_game_time_dt
+
         for loc_entry in memory.short_term_location_history:
+            # Same Euclidean distance as Position.distance_to, without building (and validating) Position objects per entry.
+            # Far-away entries are rejected before any datetime work.
+            if math.hypot(loc_entry.x - x, loc_entry.y - y) >= visit_threshold_distance:
+                continue
+
             # loc_entry.timestamp_visited is already a datetime object due to Pydantic model
-            # current_game_time_dt is also a datetime object
-            
-            # Create Position objects for distance calculation
-            loc_pos = Position(x=loc_entry.x, y=loc_entry.y)
-            target_pos = Position(x=x, y=y)
-            distance = loc_pos.distance_to(target_pos)
-            
-            # Ensure both datetime objects are comparable (e.g., both aware or both naive)
-            # Pydantic models with default_aware_utcnow and GameTime.current_timestamp (if parsed from ISO string)
-            # should generally produce aware datetime objects.
-            if loc_entry.timestamp_visited.tzinfo is None and current_game_time_dt.tzinfo is not None:
-                # This case should be rare if GameTime.current_timestamp is always from Unity (ISO string -> aware datetime)
-                # and VisitedLocationEntry.timestamp_visited is also stored as aware.
-                # However, as a safeguard:
-                loc_timestamp_aware = loc_entry.timestamp_visited.replace(tzinfo=timezone.utc)
-                logger.warning(f"NPC '{self.npc_id}': Naive timestamp encountered in location history. Assuming UTC for comparison.")
-            elif loc_entry.timestamp_visited.tzinfo is not None and current_game_time_dt.tzinfo is None:
-                current_game_time_dt_aware = current_game_time_dt.replace(tzinfo=timezone.utc)
+            loc_timestamp_aware = loc_entry.timestamp_visited
+            if loc_timestamp_aware.tzinfo is None:
+                loc_timestamp_aware = loc_timestamp_aware.replace(tzinfo=timezone.utc)
+                if not current_game_time_naive:
+                    logger.warning(f"NPC '{self.npc_id}': Naive timestamp encountered in location history. Assuming UTC for comparison.")
+            elif current_game_time_naive:
                 logger.warning(f"NPC '{self.npc_id}': Naive current_game_time_dt encountered. Assuming UTC for comparison.")
-            else:
-                loc_timestamp_aware = loc_entry.timestamp_visited
-                current_game_time_dt_aware = current_game_time_dt
 
-            time_since_visit = current_game_time_dt_aware - loc_timestamp_aware # MODIFIED
-            
-            if distance < settings.VISIT_THRESHOLD_DISTANCE and \
-               time_since_visit.total_seconds() >= 0 and \
-               time_since_visit.total_seconds() < settings.REVISIT_INTERVAL_SECONDS: # MODIFIED: Ensure time_since_visit is not negative
-                logger.debug(f"Location ({x:.1f}, {y:.1f}) for NPC '{self.npc_id}' is RECENTLY VISITED (visited {time_since_visit.total_seconds():.0f} game seconds ago).")
+            seconds_since_visit = (current_game_time_dt_aware - loc_timestamp_aware).total_seconds()
+            if 0 <= seconds_since_visit < revisit_interval_seconds: # Ensure time since visit is not negative
+                logger.debug(f"Location ({x:.1f}, {y:.1f}) for NPC '{self.npc_id}' is RECENTLY VISITED (visited {seconds_since_visit:.0f} game seconds ago).")
                 return True
         return False
 
@@ -230,7 +229,7 @@ class NPCMemoryService:
         memory = await self.get_memory_data()
         if not memory.long_term_event_memories:
             return []
-        return sorted(memory.long_term_event_memories, key=lambda m: m.timestamp_created, reverse=True)[:limit]
+        return heapq.nlargest(limit, memory.long_term_event_memories, key=lambda m: m.timestamp_created)
 
     async def clear_all_memory_data_file(self) -> bool:
         """Deletes the NPC's memory file from disk. Cache will be invalidated on next get."""
@@ -257,24 +256,28 @@ class NPCMemoryService:
 async def save_all_dirty_npc_memories():
     logger.info(f"Attempting to save all dirty NPC memories. Known instances: {len(_INSTANTIATED_MEMORY_SERVICES)}")
     saved_count = 0
-    save_tasks = []
-    
+    save_semaphore = asyncio.Semaphore(MAX_CONCURRENT_MEMORY_SAVES)
+
+    async def _save_with_limit(service_instance: NPCMemoryService) -> None:
+        async with save_semaphore:
+            await service_instance.save_memory_to_file(force_save=True) # force_save=True to ensure it writes
+
     # Iterate over a copy of items in case the dictionary is modified during iteration (though less likely here)
+    dirty_npc_ids: List[str] = []
+    save_tasks = []
     for npc_id, service_instance in list(_INSTANTIATED_MEMORY_SERVICES.items()):
         # On shutdown, force_save might be true if we want to ensure even non-dirty loaded data is flushed.
         # However, sticking to _is_dirty is usually sufficient if all modifications correctly mark as dirty.
         if service_instance._is_dirty: # Only save if actually marked dirty
             logger.debug(f"Shutdown save: Queueing save for dirty NPC '{npc_id}'.")
-            save_tasks.append(service_instance.save_memory_to_file(force_save=True)) # force_save=True to ensure it writes
+            dirty_npc_ids.append(npc_id)
+            save_tasks.append(_save_with_limit(service_instance))
 
     if save_tasks:
         results = await asyncio.gather(*save_tasks, return_exceptions=True)
-        for i, result in enumerate(results):
-            # This part of associating result with npc_id is a bit indirect here.
-            # For more robust error reporting, task could carry npc_id.
+        for npc_id, result in zip(dirty_npc_ids, results):
             if isinstance(result, Exception):
-                # We need a way to know which NPC's save failed if we want to log specific npc_id
-                logger.error(f"Shutdown save: Error saving memory for an NPC: {result}", exc_info=result)
+                logger.error(f"Shutdown save: Error saving memory for NPC '{npc_id}': {result}", exc_info=result)
             else:
                 saved_count +=1
         logger.info(f"Shutdown save: Processed {len(save_tasks)} potential saves. Successfully saved: {saved_count} dirty memories.")
@@ -0,0 +1,27 @@
+# npc_api_suite/tests/test_prompt_builder.py
+
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from app.core.schemas import GameTime, VisitedLocationEntry
+from app.llm.prompt_builder import _format_location_history_for_prompt
+
+_UTC_PLUS_8 = timezone(timedelta(hours=8))
+
+
+class LocationHistoryTimestampTests(unittest.TestCase):
+    def test_naive_visit_timestamp_is_read_as_utc(self):
+        # 12:00 at UTC+8 is 04:00 UTC; a naive 03:59 visit is one minute earlier in UTC,
+        # not 03:59 at UTC+8 (which would be the previous evening).
+        current_time = GameTime(current_timestamp=datetime(2024, 1, 1, 12, 0, tzinfo=_UTC_PLUS_8), time_of_day="midday")
+        history = [VisitedLocationEntry(x=1.0, y=2.0, timestamp_visited=datetime(2024, 1, 1, 3, 59))]
+        self.assertIn("~1 min ago", _format_location_history_for_prompt(history, current_time))
+
+    def test_naive_current_time_is_read_as_utc(self):
+        current_time = GameTime(current_timestamp=datetime(2024, 1, 1, 4, 0), time_of_day="morning")
+        history = [VisitedLocationEntry(x=1.0, y=2.0, timestamp_visited=datetime(2024, 1, 1, 11, 59, tzinfo=_UTC_PLUS_8))]
+        self.assertIn("~1 min ago", _format_location_history_for_prompt(history, current_time))
+
+
+if __name__ == "__main__":
+    unittest.main()
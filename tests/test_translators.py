@@ -0,0 +1,66 @@
+# npc_api_suite/tests/test_translators.py
+
+import re
+import unittest
+from unittest import mock
+
+from app.core.config import settings_instance as settings
+from app.llm.translators import (
+    TextTranslatorService, MAX_TRANSLATION_BATCH_SIZE, TRANSLATION_CACHE_MAX_TEXT_LENGTH, _LARGE_TRANSLATION_CTX
+)
+
+_NUMBERED_INPUT_LINE = re.compile(r"^(\d+): ")
+
+
+class _FakeOllamaService:
+    """Records each chat call and answers numbered batches line by line, single texts with one line."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def generate_chat_completion(self, model, messages, stream, options):
+        user_content = messages[-1].content
+        self.calls.append((user_content, options))
+        input_lines = user_content.split("\n")
+        if all(_NUMBERED_INPUT_LINE.match(line) for line in input_lines):
+            content = "\n".join(f"{line_number}: translated" for line_number in range(1, len(input_lines) + 1))
+        else:
+            content = "translated"
+        return {"message": {"role": "assistant", "content": content}}
+
+
+class TranslateTextsBatchingTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(settings, "ENABLE_TRANSLATION_LOGGING", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.ollama_service = _FakeOllamaService()
+        self.translator = TextTranslatorService(self.ollama_service)
+
+    async def test_short_texts_share_one_batch(self):
+        texts = [f"Line number {i} of the scene." for i in range(MAX_TRANSLATION_BATCH_SIZE)]
+        results = await self.translator.translate_texts(texts)
+        self.assertEqual(results, ["translated"] * len(texts))
+        self.assertEqual(len(self.ollama_service.calls), 1)
+
+    async def test_long_texts_are_translated_one_by_one(self):
+        texts = [f"{i} " + "x" * (TRANSLATION_CACHE_MAX_TEXT_LENGTH + 100) for i in range(MAX_TRANSLATION_BATCH_SIZE)]
+        results = await self.translator.translate_texts(texts)
+        self.assertEqual(results, ["translated"] * len(texts))
+        self.assertEqual(len(self.ollama_service.calls), len(texts))
+        for user_content, _ in self.ollama_service.calls:
+            self.assertEqual(user_content.count("x" * (TRANSLATION_CACHE_MAX_TEXT_LENGTH + 100)), 1)
+
+    async def test_batches_stay_within_large_context(self):
+        # Each text is cacheable, but eight of them together would overflow the larger context preset.
+        texts = [f"{i} " + "y" * (TRANSLATION_CACHE_MAX_TEXT_LENGTH - 10) for i in range(MAX_TRANSLATION_BATCH_SIZE)]
+        results = await self.translator.translate_texts(texts)
+        self.assertEqual(results, ["translated"] * len(texts))
+        self.assertGreater(len(self.ollama_service.calls), 1)
+        for user_content, options in self.ollama_service.calls:
+            self.assertLessEqual(options.num_ctx, _LARGE_TRANSLATION_CTX)
+            self.assertLessEqual((len(user_content) // 3) * 2 + 128, _LARGE_TRANSLATION_CTX)
+
+
+if __name__ == "__main__":
+    unittest.main()